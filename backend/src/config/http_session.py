@@ -0,0 +1,100 @@
+"""
+Datrix™ Business Intelligence Scanner
+Pooled keep-alive HTTP session for Supabase REST calls
+"""
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Statuses worth retrying: rate limiting and transient gateway/server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# POST is left out so a retried insert can never create duplicate rows
+RETRY_METHODS = frozenset(['HEAD', 'GET', 'OPTIONS', 'PUT', 'PATCH', 'DELETE'])
+
+class PooledSession:
+    """Thread-safe keep-alive session with retries and default timeouts
+
+    One HTTPAdapter (and therefore one urllib3 connection pool) is shared by
+    every thread, so TLS connections to Supabase are reused across requests.
+    Each thread gets its own requests.Session on top of it because Session
+    state such as cookies is not safe to share between threads.
+    """
+
+    def __init__(self, pool_size: int = 10, connect_timeout: float = 5,
+                 read_timeout: float = 30, max_retries: int = 3,
+                 backoff_factor: float = 0.3):
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        """Get the calling thread's session, creating it on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self.adapter)
+            session.mount('http://', self.adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared pool"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self._session().request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request('DELETE', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def close(self):
+        """Close pooled connections"""
+        self.adapter.close()
+
+
+# Global session instance
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> PooledSession:
+    """Get or create the shared pooled session"""
+    global _http_session
+
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = PooledSession(
+                    pool_size=int(os.getenv('SUPABASE_POOL_SIZE', '10')),
+                    connect_timeout=float(os.getenv('SUPABASE_CONNECT_TIMEOUT', '5')),
+                    read_timeout=float(os.getenv('SUPABASE_READ_TIMEOUT', '30')),
+                    max_retries=int(os.getenv('SUPABASE_MAX_RETRIES', '3')),
+                    backoff_factor=float(os.getenv('SUPABASE_RETRY_BACKOFF', '0.3'))
+                )
+
+    return _http_session
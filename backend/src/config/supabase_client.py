@@ -5,55 +5,532 @@ Supabase Client using HTTP Requests (No external dependencies)
 
 import os
 import json
-import urllib.request
-import urllib.error
-from typing import Dict, List, Optional, Any
+import http.client
+import select
+import ssl
+import threading
+import time
+import concurrent.futures
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+# Retry policy shared with PooledSession
+from src.config.http_session import RETRY_METHODS, RETRY_STATUSES
+
+# PostgREST count strategies accepted in the Prefer header
+COUNT_MODES = ('exact', 'planned', 'estimated')
+
+# How much of a written row PostgREST sends back (Prefer: return=...)
+RETURNING_MODES = ('minimal', 'headers-only', 'representation')
+
+def parse_content_range(header: Optional[str]) -> Optional[int]:
+    """Total row count from a PostgREST Content-Range header ("0-24/3573" or "*/0")"""
+    if not header or '/' not in header:
+        return None
+    total = header.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
+def quote_value(value) -> str:
+    """Double-quote a value for a PostgREST list or logic tree, e.g. in.(...) or or=(...)"""
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+def format_value(value) -> str:
+    """Render a Python value the way PostgREST filters expect"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+def encode_query(params) -> str:
+    """URL-encode query parameters given as a dict or a list of (key, value) pairs
+    
+    Repeated keys are kept, so one column can carry several filters.
+    """
+    items = params.items() if isinstance(params, dict) else params
+    return urlencode([(key, format_value(value)) for key, value in items],
+                     quote_via=quote, safe=',.()*:!')
+
+class QueryResult:
+    """Rows returned by a query, with the total count when one was requested"""
+    
+    def __init__(self, data: Any, count: Optional[int] = None, status: int = 200, error: str = None):
+        self.data = data
+        self.count = count
+        self.status = status
+        self.error = error
+
+class QueryBuilder:
+    """Chainable PostgREST query, e.g.
+    
+        (client.query('assessments', use_service_key=True)
+            .select('id,percentage')
+            .embed('users', 'full_name,business_type', inner=True)
+            .gte('completed_at', '2025-01-01')
+            .in_('overall_grade', ['A', 'B'])
+            .eq('users.business_type', 'Garment Manufacturing')
+            .order('completed_at', desc=True)
+            .range(0, 99)
+            .execute())
+    
+    Filters, ordering and paging are sent as query parameters so they run in
+    Postgres; values are URL-encoded, and list values are quoted so commas
+    and parentheses inside them are safe.
+    """
+    
+    def __init__(self, client: 'SupabaseClient', table: str, use_service_key: bool = False):
+        self.client = client
+        self.table = table
+        self.use_service_key = use_service_key
+        self._columns = ['*']
+        self._filters: List[Tuple[str, str]] = []
+        self._orders: Dict[Optional[str], List[str]] = {}
+        self._params: List[Tuple[str, Any]] = []
+        self._headers: Dict[str, str] = {}
+        self._count: Optional[str] = None
+    
+    def select(self, *columns: str) -> 'QueryBuilder':
+        """Columns and embedded resources to return (default '*')"""
+        self._columns = list(columns) or ['*']
+        return self
+    
+    def embed(self, resource: str, columns: str = '*', inner: bool = False,
+              alias: str = None) -> 'QueryBuilder':
+        """Embed a related table; inner=True keeps only rows that have a match"""
+        embedded = f"{resource}!inner({columns})" if inner else f"{resource}({columns})"
+        self._columns.append(f"{alias}:{embedded}" if alias else embedded)
+        return self
+    
+    def filter(self, column: str, operator: str, value: Any) -> 'QueryBuilder':
+        """Add any PostgREST filter, e.g. filter('percentage', 'gte', 75)"""
+        self._filters.append((column, f"{operator}.{format_value(value)}"))
+        return self
+    
+    def where(self, column: str, condition: str) -> 'QueryBuilder':
+        """Add a filter already in PostgREST form, e.g. where('percentage', 'gte.75')"""
+        self._filters.append((column, condition))
+        return self
+    
+    def eq(self, column: str, value: Any) -> 'QueryBuilder':
+        return self.filter(column, 'eq', value)
+    
+    def neq(self, column: str, value: Any) -> 'QueryBuilder':
+        return self.filter(column, 'neq', value)
+    
+    def gt(self, column: str, value: Any) -> 'QueryBuilder':
+        return self.filter(column, 'gt', value)
+    
+    def gte(self, column: str, value: Any) -> 'QueryBuilder':
+        return self.filter(column, 'gte', value)
+    
+    def lt(self, column: str, value: Any) -> 'QueryBuilder':
+        return self.filter(column, 'lt', value)
+    
+    def lte(self, column: str, value: Any) -> 'QueryBuilder':
+        return self.filter(column, 'lte', value)
+    
+    def like(self, column: str, pattern: str) -> 'QueryBuilder':
+        """Case-sensitive pattern match; use * (or %) as the wildcard"""
+        return self.filter(column, 'like', pattern)
+    
+    def ilike(self, column: str, pattern: str) -> 'QueryBuilder':
+        """Case-insensitive pattern match; use * (or %) as the wildcard"""
+        return self.filter(column, 'ilike', pattern)
+    
+    def is_(self, column: str, value: Optional[bool]) -> 'QueryBuilder':
+        """IS NULL / IS TRUE / IS FALSE"""
+        return self.filter(column, 'is', value)
+    
+    def in_(self, column: str, values) -> 'QueryBuilder':
+        return self.filter(column, 'in', f"({','.join(quote_value(value) for value in values)})")
+    
+    def match(self, filters: Dict[str, Any]) -> 'QueryBuilder':
+        """eq filter for every key of a dict"""
+        for column, value in filters.items():
+            self.eq(column, value)
+        return self
+    
+    def or_(self, *conditions, foreign_table: str = None) -> 'QueryBuilder':
+        """Match any condition
+        
+        Each condition is a (column, operator, value) tuple, whose value is
+        quoted for you, or a raw PostgREST condition such as
+        'and(grade.eq.A,tier.eq.Gold)'.
+        """
+        rendered = []
+        for condition in conditions:
+            if isinstance(condition, tuple):
+                column, operator, value = condition
+                if operator != 'is':
+                    value = quote_value(format_value(value))
+                rendered.append(f"{column}.{operator}.{format_value(value)}")
+            else:
+                rendered.append(condition)
+        key = f"{foreign_table}.or" if foreign_table else 'or'
+        self._filters.append((key, f"({','.join(rendered)})"))
+        return self
+    
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None,
+              foreign_table: str = None) -> 'QueryBuilder':
+        """Sort by a column; call again to add tie-breakers"""
+        term = f"{column}.{'desc' if desc else 'asc'}"
+        if nullsfirst is not None:
+            term += '.nullsfirst' if nullsfirst else '.nullslast'
+        self._orders.setdefault(foreign_table, []).append(term)
+        return self
+    
+    def limit(self, count: int, foreign_table: str = None) -> 'QueryBuilder':
+        self._params.append((f"{foreign_table}.limit" if foreign_table else 'limit', int(count)))
+        return self
+    
+    def offset(self, count: int, foreign_table: str = None) -> 'QueryBuilder':
+        self._params.append((f"{foreign_table}.offset" if foreign_table else 'offset', int(count)))
+        return self
+    
+    def range(self, start: int, end: int) -> 'QueryBuilder':
+        """Rows start..end inclusive, requested with a Range header"""
+        self._headers['Range-Unit'] = 'items'
+        self._headers['Range'] = f"{int(start)}-{int(end)}"
+        return self
+    
+    def count(self, mode: str = 'exact') -> 'QueryBuilder':
+        """Also return the total number of matching rows (exact, planned or estimated)"""
+        if mode not in COUNT_MODES:
+            raise ValueError(f"count mode must be one of {', '.join(COUNT_MODES)}")
+        self._count = mode
+        return self
+    
+    def build_params(self) -> List[Tuple[str, Any]]:
+        """Query parameters for this query, in order"""
+        params = [('select', ','.join(self._columns))]
+        params.extend(self._filters)
+        for foreign_table, terms in self._orders.items():
+            params.append((f"{foreign_table}.order" if foreign_table else 'order', ','.join(terms)))
+        params.extend(self._params)
+        return params
+    
+    def build_headers(self) -> Dict[str, str]:
+        """Extra request headers for this query (Range, count preference)"""
+        headers = dict(self._headers)
+        if self._count:
+            headers['Prefer'] = f"count={self._count}"
+        return headers
+    
+    def to_result(self, status: int, response_headers, body: bytes) -> QueryResult:
+        """Turn a raw PostgREST response into a QueryResult"""
+        response_data = body.decode('utf-8')
+        if status >= 400:
+            print(f"Supabase error: {status} - {response_data}")
+            return QueryResult([], status=status, error=response_data)
+        
+        count = parse_content_range(response_headers.get('Content-Range')) if self._count else None
+        return QueryResult(json.loads(response_data) if response_data else [], count=count, status=status)
+    
+    def execute(self, head: bool = False) -> QueryResult:
+        """Run the query; head=True sends HEAD so only the count comes back"""
+        try:
+            status, response_headers, body = self.client._send(
+                'HEAD' if head else 'GET', self.table, params=self.build_params(),
+                use_service_key=self.use_service_key, headers=self.build_headers()
+            )
+        except Exception as e:
+            print(f"Request error: {str(e)}")
+            return QueryResult([], status=0, error=str(e))
+        
+        return self.to_result(status, response_headers, body)
+
+class ConnectionPool:
+    """Thread-safe pool of persistent HTTP(S) connections to one host
+    
+    At most max_connections are open at once; callers wait for a free one.
+    Idle connections are closed after idle_timeout, and every connection is
+    health-checked before reuse: a socket that is readable while idle has
+    been closed (or garbled) by the server and is replaced.
+    
+    Connects time out after connect_timeout and reads after timeout.
+    Idempotent requests answered with 429 or a transient 5xx are retried
+    up to max_retries times, honouring a Retry-After no longer than timeout
+    and otherwise backing off exponentially.
+    """
+    
+    def __init__(self, scheme: str, host: str, port: int = None, max_connections: int = 10,
+                 idle_timeout: float = 60, timeout: float = 30, connect_timeout: float = 5,
+                 max_retries: int = 3, backoff_factor: float = 0.3):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._ssl_context = ssl.create_default_context() if scheme == 'https' else None
+    
+    def _connect(self) -> http.client.HTTPConnection:
+        """New connection; it connects with connect_timeout on first use"""
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.connect_timeout,
+                                               context=self._ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.connect_timeout)
+    
+    @staticmethod
+    def _is_healthy(conn: http.client.HTTPConnection) -> bool:
+        if conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+    
+    def acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Take a connection, returning (connection, reused)"""
+        self._slots.acquire()
+        now = time.monotonic()
+        
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+            if now - last_used <= self.idle_timeout and self._is_healthy(conn):
+                return conn, True
+            conn.close()
+        
+        return self._connect(), False
+    
+    def release(self, conn: http.client.HTTPConnection, reusable: bool = True):
+        """Return a connection; it is closed instead when not reusable"""
+        try:
+            if reusable and conn.sock is not None:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+            else:
+                conn.close()
+        finally:
+            self._slots.release()
+    
+    def _retry_delay(self, retries: int, response_headers: http.client.HTTPMessage) -> Optional[float]:
+        """Seconds to wait before retry number retries + 1, or None to give up
+        
+        A Retry-After longer than the read timeout is not waited out; the
+        caller gets the 429/503 straight away instead of a request that
+        blocks for as long as the server asks.
+        """
+        retry_after = response_headers.get('Retry-After')
+        if retry_after and retry_after.strip().isdigit():
+            delay = float(retry_after)
+            return delay if delay <= self.timeout else None
+        return self.backoff_factor * (2 ** retries)
+    
+    def request(self, method: str, path: str, body: bytes = None,
+                headers: Dict = None) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a request, retrying idempotent ones on 429 and transient 5xx replies"""
+        retries = 0
+        while True:
+            status, response_headers, data = self._request_once(method, path, body, headers)
+            if (method.upper() not in RETRY_METHODS or status not in RETRY_STATUSES
+                    or retries >= self.max_retries):
+                return status, response_headers, data
+            delay = self._retry_delay(retries, response_headers)
+            if delay is None:
+                return status, response_headers, data
+            time.sleep(delay)
+            retries += 1
+    
+    def _request_once(self, method: str, path: str, body: bytes = None,
+                      headers: Dict = None) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a request on a pooled connection and read the whole response
+        
+        A reused connection can turn out to have been dropped by the server
+        just as the request is sent. For idempotent methods that attempt is
+        repeated once on a fresh connection; a POST may already have been
+        applied, so its error is raised instead.
+        """
+        replayable = method.upper() in RETRY_METHODS
+        for attempt in range(2):
+            conn, reused = self.acquire()
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                    conn.sock.settimeout(self.timeout)
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.release(conn, reusable=False)
+                if reused and replayable and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                self.release(conn, reusable=False)
+                raise
+            
+            self.release(conn, reusable=not response.will_close)
+            return response.status, response.headers, data
+    
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for conn, _ in idle:
+            conn.close()
+
 
 class SupabaseClient:
-    """Simple Supabase client using HTTP requests"""
+    """Simple Supabase client using HTTP requests
+    
+    Requests go over a pool of keep-alive connections per host, so a warm
+    call costs one round-trip instead of DNS, TCP and TLS setup each time.
+    Independent calls can run concurrently with fan_out().
+    """
     
-    def __init__(self, url: str, key: str, service_key: str = None):
+    def __init__(self, url: str, key: str, service_key: str = None, pool_size: int = 10,
+                 idle_timeout: float = 60, timeout: float = 30, connect_timeout: float = 5,
+                 max_retries: int = 3, backoff_factor: float = 0.3):
         self.url = url.rstrip('/')
         self.key = key
         self.service_key = service_key or key
         self.rest_url = f"{self.url}/rest/v1"
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._pools: Dict[Tuple[str, str, Optional[int]], ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def _get_pool(self, scheme: str, host: str, port: Optional[int]) -> ConnectionPool:
+        """Connection pool for a host, created on first use"""
+        with self._pools_lock:
+            pool = self._pools.get((scheme, host, port))
+            if pool is None:
+                pool = ConnectionPool(scheme, host, port, max_connections=self.pool_size,
+                                      idle_timeout=self.idle_timeout, timeout=self.timeout,
+                                      connect_timeout=self.connect_timeout,
+                                      max_retries=self.max_retries, backoff_factor=self.backoff_factor)
+                self._pools[(scheme, host, port)] = pool
+            return pool
+    
+    def close(self):
+        """Close all idle pooled connections and stop the fan_out workers"""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Worker threads for fan_out, created on first use and capped at the pool size"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                    thread_name_prefix='supabase-fan-out')
+            return self._executor
+    
+    def fan_out(self, *calls: Callable[[], Any], return_exceptions: bool = False,
+                timeout: float = None) -> List[Any]:
+        """Run independent calls concurrently and return their results in order
         
-    def _make_request(self, method: str, endpoint: str, data: Dict = None, 
-                     use_service_key: bool = False, params: Dict = None) -> Dict:
-        """Make HTTP request to Supabase"""
-        url = f"{self.rest_url}/{endpoint}"
+        Each call is a zero-argument callable, such as a query's bound
+        execute or the question catalogue's get, so a handler waits for the
+        slowest call instead of the sum of all of them:
         
-        # Add query parameters
-        if params:
-            query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-            url = f"{url}?{query_string}"
+            user_result, catalog = client.fan_out(
+                client.query('users', use_service_key=True).eq('assessment_token', token).execute,
+                question_catalog.get,
+                timeout=10
+            )
+        
+        With return_exceptions a failed call's exception takes its place in
+        the results; otherwise the first failure is raised. Raises
+        concurrent.futures.TimeoutError if the calls have not all finished
+        after `timeout` seconds (default: the client timeout); calls that
+        have not started are cancelled.
+        """
+        executor = self._get_executor()
+        submitted = [executor.submit(call) for call in calls]
+        _, pending = concurrent.futures.wait(submitted, timeout=self.timeout if timeout is None else timeout)
+        if pending:
+            for future in pending:
+                future.cancel()
+            raise concurrent.futures.TimeoutError(f'{len(pending)} of {len(calls)} calls did not finish in time')
         
-        headers = {
-            'apikey': self.service_key if use_service_key else self.key,
-            'Authorization': f'Bearer {self.service_key if use_service_key else self.key}',
+        if return_exceptions:
+            return [future.exception() or future.result() for future in submitted]
+        return [future.result() for future in submitted]
+        
+    def auth_headers(self, use_service_key: bool = False) -> Dict[str, str]:
+        """Default request headers for the anon or service role key"""
+        key = self.service_key if use_service_key else self.key
+        return {
+            'apikey': key,
+            'Authorization': f'Bearer {key}',
             'Content-Type': 'application/json',
             'Prefer': 'return=representation'
         }
+    
+    def _send(self, method: str, endpoint: str, data: Any = None, use_service_key: bool = False,
+              params=None, headers: Dict = None) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a request and return (status, response headers, body)"""
+        url = f"{self.rest_url}/{endpoint}"
+        
+        # Add query parameters
+        if params:
+            url = f"{url}?{encode_query(params)}"
+        
+        request_headers = self.auth_headers(use_service_key)
+        request_headers.update(headers or {})
         
         request_data = json.dumps(data).encode('utf-8') if data else None
         
+        parts = urlsplit(url)
+        path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        pool = self._get_pool(parts.scheme, parts.hostname, parts.port)
+        return pool.request(method, path, body=request_data, headers=request_headers)
+    
+    def _make_request(self, method: str, endpoint: str, data: Dict = None, 
+                     use_service_key: bool = False, params: Dict = None) -> Dict:
+        """Make HTTP request to Supabase"""
         try:
-            req = urllib.request.Request(url, data=request_data, headers=headers, method=method)
-            with urllib.request.urlopen(req) as response:
-                response_data = response.read().decode('utf-8')
-                return json.loads(response_data) if response_data else {}
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8')
-            print(f"Supabase error: {e.code} - {error_body}")
-            return {'error': error_body, 'status': e.code}
+            status, _, body = self._send(method, endpoint, data=data, use_service_key=use_service_key,
+                                         params=params)
+            response_data = body.decode('utf-8')
+            
+            if status >= 400:
+                print(f"Supabase error: {status} - {response_data}")
+                return {'error': response_data, 'status': status}
+            
+            return json.loads(response_data) if response_data else {}
         except Exception as e:
             print(f"Request error: {str(e)}")
             return {'error': str(e)}
     
+    def query(self, table: str, use_service_key: bool = False) -> QueryBuilder:
+        """Start a chainable query on a table"""
+        return QueryBuilder(self, table, use_service_key)
+    
     def select(self, table: str, columns: str = '*', filters: Dict = None, 
-              use_service_key: bool = False) -> List[Dict]:
-        """Select data from table"""
-        params = {'select': columns}
+              use_service_key: bool = False, params: Dict = None) -> List[Dict]:
+        """Select data from table
+        
+        params passes extra PostgREST query parameters through unencoded,
+        e.g. {'order': 'id.asc', 'limit': 100, 'completed_at': 'gte.2025-01-01'};
+        they are URL-encoded on the way out. For anything beyond eq filters
+        prefer query().
+        """
+        params = {'select': columns, **(params or {})}
         
         if filters:
             for key, value in filters.items():
@@ -62,19 +539,114 @@ class SupabaseClient:
         result = self._make_request('GET', table, params=params, use_service_key=use_service_key)
         return result if isinstance(result, list) else []
     
-    def insert(self, table: str, data: Dict, use_service_key: bool = False) -> Dict:
-        """Insert data into table"""
-        result = self._make_request('POST', table, data=data, use_service_key=use_service_key)
-        return result[0] if isinstance(result, list) and len(result) > 0 else result
+    def _write(self, method: str, table: str, data: Any, use_service_key: bool = False,
+               params=None, returning: str = 'representation', prefer: List[str] = None) -> Dict:
+        """Send a write and return {'status', 'rows', 'location', 'error'}
+        
+        returning picks how much PostgREST echoes back: 'representation'
+        (the written rows), 'headers-only' (just the Location header) or
+        'minimal' (nothing).
+        """
+        if returning not in RETURNING_MODES:
+            raise ValueError(f"returning must be one of {', '.join(RETURNING_MODES)}")
+        
+        preferences = [f"return={returning}"] + (prefer or [])
+        try:
+            status, headers, body = self._send(method, table, data=data, use_service_key=use_service_key,
+                                               params=params, headers={'Prefer': ','.join(preferences)})
+        except Exception as e:
+            print(f"Request error: {str(e)}")
+            return {'status': 0, 'rows': [], 'location': None, 'error': str(e)}
+        
+        response_data = body.decode('utf-8')
+        if status >= 400:
+            print(f"Supabase error: {status} - {response_data}")
+            return {'status': status, 'rows': [], 'location': None, 'error': response_data}
+        
+        rows = json.loads(response_data) if response_data else []
+        return {
+            'status': status,
+            'rows': rows if isinstance(rows, list) else [rows],
+            'location': headers.get('Location'),
+            'error': None
+        }
+    
+    def insert(self, table: str, data: Dict, use_service_key: bool = False,
+               returning: str = 'representation') -> Dict:
+        """Insert data into table
+        
+        Returns the inserted row; with returning='minimal' or 'headers-only'
+        nothing is echoed back and {} is returned on success.
+        """
+        if returning == 'representation':
+            result = self._make_request('POST', table, data=data, use_service_key=use_service_key)
+            return result[0] if isinstance(result, list) and len(result) > 0 else result
+        
+        result = self._write('POST', table, data, use_service_key=use_service_key, returning=returning)
+        if result['error']:
+            return {'error': result['error'], 'status': result['status']}
+        return {'location': result['location']} if result['location'] else {}
     
-    def update(self, table: str, data: Dict, filters: Dict, use_service_key: bool = False) -> Dict:
-        """Update data in table"""
+    def bulk_insert(self, table: str, rows: List[Dict], use_service_key: bool = False,
+                    chunk_size: int = 500, returning: str = 'minimal', upsert: bool = False,
+                    on_conflict: str = None, ignore_duplicates: bool = False) -> List[Dict]:
+        """Insert rows with one array-bodied POST per chunk
+        
+        With upsert=True rows that collide on on_conflict (a unique column
+        list, default the primary key) are merged, or skipped when
+        ignore_duplicates=True. Every row in a chunk must have the same keys.
+        Returns one {'offset', 'count', 'success', 'error', 'rows'} entry per
+        chunk; rows is only filled when returning='representation'.
+        """
+        prefer = []
+        params = {}
+        if upsert:
+            prefer.append('resolution=ignore-duplicates' if ignore_duplicates else 'resolution=merge-duplicates')
+            if on_conflict:
+                params['on_conflict'] = on_conflict
+        
+        results = []
+        for offset in range(0, len(rows), chunk_size):
+            chunk = rows[offset:offset + chunk_size]
+            result = self._write('POST', table, chunk, use_service_key=use_service_key,
+                                 params=params, returning=returning, prefer=prefer)
+            results.append({
+                'offset': offset,
+                'count': len(chunk),
+                'success': result['error'] is None,
+                'error': result['error'],
+                'rows': result['rows']
+            })
+        
+        return results
+    
+    def upsert(self, table: str, rows: List[Dict], on_conflict: str = None, use_service_key: bool = False,
+               chunk_size: int = 500, returning: str = 'minimal', ignore_duplicates: bool = False) -> List[Dict]:
+        """Insert or merge rows on on_conflict; see bulk_insert"""
+        return self.bulk_insert(table, rows, use_service_key=use_service_key, chunk_size=chunk_size,
+                                returning=returning, upsert=True, on_conflict=on_conflict,
+                                ignore_duplicates=ignore_duplicates)
+    
+    def update(self, table: str, data: Dict, filters: Dict, use_service_key: bool = False,
+               returning: str = 'representation') -> Dict:
+        """Update data in table
+        
+        Returns the first updated row; with returning='minimal' nothing is
+        echoed back and {} is returned on success.
+        """
         params = {}
         for key, value in filters.items():
             params[key] = f"eq.{value}"
         
-        result = self._make_request('PATCH', table, data=data, params=params, use_service_key=use_service_key)
-        return result[0] if isinstance(result, list) and len(result) > 0 else result
+        if returning == 'representation':
+            result = self._make_request('PATCH', table, data=data, params=params, use_service_key=use_service_key)
+            return result[0] if isinstance(result, list) and len(result) > 0 else result
+        
+        result = self._write('PATCH', table, data, use_service_key=use_service_key, params=params,
+                             returning=returning)
+        if result['error']:
+            return {'error': result['error'], 'status': result['status']}
+        return {}
     
     def delete(self, table: str, filters: Dict, use_service_key: bool = False) -> Dict:
         """Delete data from table"""
@@ -84,16 +656,41 @@ class SupabaseClient:
         
         return self._make_request('DELETE', table, params=params, use_service_key=use_service_key)
     
-    def count(self, table: str, filters: Dict = None, use_service_key: bool = False) -> int:
-        """Count rows in table"""
-        params = {'select': 'id', 'count': 'exact'}
+    def rpc(self, function: str, params: Dict = None, use_service_key: bool = False) -> Any:
+        """Call a database function; returns its result, or {'error', 'status'} on failure"""
+        return self._make_request('POST', f'rpc/{function}', data=params or {}, use_service_key=use_service_key)
+    
+    def count(self, table: str, filters: Dict = None, use_service_key: bool = False,
+              mode: str = 'exact') -> int:
+        """Count rows in table on the server
+        
+        Sends a HEAD request with Prefer: count=<mode> and reads the total
+        from Content-Range, so no rows are transferred. mode is 'exact',
+        'planned' (the planner's estimate, instant on huge tables) or
+        'estimated' (exact below PostgREST's max-rows, planned above).
+        Returns 0 if the count cannot be read.
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(f"count mode must be one of {', '.join(COUNT_MODES)}")
+        
+        params = {'select': 'id'}
         
         if filters:
             for key, value in filters.items():
                 params[key] = f"eq.{value}"
         
-        result = self._make_request('GET', table, params=params, use_service_key=use_service_key)
-        return len(result) if isinstance(result, list) else 0
+        try:
+            status, headers, _ = self._send('HEAD', table, params=params, use_service_key=use_service_key,
+                                            headers={'Prefer': f'count={mode}'})
+        except Exception as e:
+            print(f"Request error: {str(e)}")
+            return 0
+        
+        if status >= 400:
+            print(f"Supabase error: {status} - count on {table} failed")
+            return 0
+        
+        return parse_content_range(headers.get('Content-Range')) or 0
 
 
 # Initialize global client
@@ -117,7 +714,15 @@ def get_supabase_client() -> Optional[SupabaseClient]:
             print("Using hardcoded Supabase credentials")
         
         if url and key:
-            _supabase_client = SupabaseClient(url, key, service_key)
+            _supabase_client = SupabaseClient(
+                url, key, service_key,
+                pool_size=int(os.getenv('SUPABASE_POOL_SIZE', '10')),
+                idle_timeout=float(os.getenv('SUPABASE_IDLE_TIMEOUT', '60')),
+                timeout=float(os.getenv('SUPABASE_READ_TIMEOUT', '30')),
+                connect_timeout=float(os.getenv('SUPABASE_CONNECT_TIMEOUT', '5')),
+                max_retries=int(os.getenv('SUPABASE_MAX_RETRIES', '3')),
+                backoff_factor=float(os.getenv('SUPABASE_RETRY_BACKOFF', '0.3'))
+            )
             print("✓ Supabase client initialized successfully")
         else:
             print("Warning: Supabase credentials not configured")
@@ -2009,59 +2009,84 @@ INDUSTRY_BENCHMARKS = {
     }
 }
 
-def calculate_assessment_score(answers):
+def compile_scoring_table(framework):
+    """Compile option scores and max scores per question and pillar"""
+    questions = {}
+    pillar_max = {}
+    
+    for question in framework["questions"]:
+        option_scores = {}
+        for option in question["options"]:
+            option_scores.setdefault(option["value"], option["score"])
+        
+        if question["type"] == "multiple_choice":
+            max_score = sum(opt["score"] for opt in question["options"] if opt["value"] != "none")
+        else:
+            max_score = max(option_scores.values(), default=0)
+        
+        questions[question["id"]] = {
+            "pillar": question["pillar"],
+            "type": question["type"],
+            "scores": option_scores,
+            "max": max_score
+        }
+        pillar_max[question["pillar"]] = pillar_max.get(question["pillar"], 0) + max_score
+    
+    return {
+        "questions": questions,
+        "pillar_max": pillar_max,
+        "max_possible": sum(pillar_max.values())
+    }
+
+# Compiled once at import; recompile if ASSESSMENT_FRAMEWORK is changed at runtime
+SCORING_TABLE = compile_scoring_table(ASSESSMENT_FRAMEWORK)
+
+def get_grade(percentage):
+    """Map a percentage to its SCORING_SYSTEM grade"""
+    for g, criteria in SCORING_SYSTEM["grades"].items():
+        if criteria["min"] <= percentage <= criteria["max"]:
+            return g
+    return "F"
+
+def calculate_assessment_score(answers, scoring_table=None):
     """Calculate comprehensive assessment score"""
+    table = (scoring_table or SCORING_TABLE)["questions"]
     total_score = 0
     max_possible = 0
     pillar_scores = {}
     
-    for question in ASSESSMENT_FRAMEWORK["questions"]:
-        q_id = question["id"]
-        if q_id in answers:
-            answer = answers[q_id]
-            pillar = question["pillar"]
-            
-            if question["type"] == "single_choice":
-                for option in question["options"]:
-                    if option["value"] == answer:
-                        score = option["score"]
-                        total_score += score
-                        max_possible += 5
-                        
-                        if pillar not in pillar_scores:
-                            pillar_scores[pillar] = {"score": 0, "max": 0}
-                        pillar_scores[pillar]["score"] += score
-                        pillar_scores[pillar]["max"] += 5
-                        break
-            
-            elif question["type"] == "multiple_choice":
-                for selected in answer:
-                    for option in question["options"]:
-                        if option["value"] == selected:
-                            score = option["score"]
-                            total_score += score
-                            break
-                max_possible += sum(opt["score"] for opt in question["options"] if opt["value"] != "none")
-                
-                if pillar not in pillar_scores:
-                    pillar_scores[pillar] = {"score": 0, "max": 0}
-                pillar_scores[pillar]["score"] += total_score
-                pillar_scores[pillar]["max"] += max_possible
+    for q_id, answer in answers.items():
+        question = table.get(q_id)
+        if question is None:
+            continue
+        
+        scores = question["scores"]
+        
+        if question["type"] == "single_choice":
+            if isinstance(answer, (list, dict)) or answer not in scores:
+                continue
+            score = scores[answer]
+        elif question["type"] == "multiple_choice":
+            score = sum(scores.get(selected, 0) for selected in answer)
+        else:
+            continue
+        
+        total_score += score
+        max_possible += question["max"]
+        
+        pillar = question["pillar"]
+        if pillar not in pillar_scores:
+            pillar_scores[pillar] = {"score": 0, "max": 0}
+        pillar_scores[pillar]["score"] += score
+        pillar_scores[pillar]["max"] += question["max"]
     
     percentage = (total_score / max_possible * 100) if max_possible > 0 else 0
     
-    # Determine grade
-    grade = "F"
-    for g, criteria in SCORING_SYSTEM["grades"].items():
-        if criteria["min"] <= percentage <= criteria["max"]:
-            grade = g
-            break
-    
     return {
         "total_score": total_score,
         "max_possible": max_possible,
         "percentage": round(percentage, 2),
-        "grade": grade,
+        "grade": get_grade(percentage),
         "pillar_scores": pillar_scores
     }
 
@@ -4,10 +4,19 @@ Admin Management Routes with Supabase Integration
 """
 
 from flask import Blueprint, request, jsonify
+import os
 import random
 import string
 from datetime import datetime
 from src.config.database import get_supabase_client, get_service_client
+from src.services.email_service import get_email_service
+from src.services.dashboard_stats import window_start, ASSESSMENTS_WINDOW_DAYS, NEW_USERS_WINDOW_DAYS
+from src.config.supabase_client import quote_value
+from src.services.keyset_pagination import (
+    ADMIN_MAX_PAGE_SIZE, ADMIN_PAGE_SIZE, ADMIN_SORT_COLUMN, ASSESSMENT_EXPANSIONS,
+    ASSESSMENT_SUMMARY_COLUMNS, encode_cursor, decode_cursor, parse_limit
+)
+from src.services.batch_scoring import GRADES as ASSESSMENT_GRADES
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -110,6 +119,107 @@ def approve_user(user_id):
         print(f"Approve user error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@admin_bp.route('/approve-users', methods=['POST'])
+def approve_users():
+    """Approve many verified users in one pass and queue their emails as one batch"""
+    try:
+        data = request.get_json() or {}
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in data.get('user_ids', [])))
+        
+        if not user_ids:
+            return jsonify({'error': 'user_ids is required'}), 400
+        
+        # Without background workers every email is sent inside this request
+        email_service = get_email_service()
+        if not email_service.background and len(user_ids) > email_service.sync_batch_limit:
+            return jsonify({
+                'error': f'At most {email_service.sync_batch_limit} users can be approved per request '
+                         'unless EMAIL_BACKGROUND is enabled'
+            }), 400
+        
+        supabase = get_service_client()
+        if not supabase:
+            return jsonify({'error': 'Database connection not available'}), 500
+        
+        # Get all requested users in one query
+        user_result = supabase.table('users').select('id, full_name, email, is_verified, is_approved').in_('id', user_ids).execute()
+        users = {str(user['id']): user for user in (user_result.data or [])}
+        
+        results = []
+        approved = []
+        for user_id in user_ids:
+            user = users.get(user_id)
+            if user is None:
+                results.append({'user_id': user_id, 'status': 'not_found'})
+            elif not user['is_verified']:
+                results.append({'user_id': user_id, 'status': 'not_verified'})
+            elif user.get('is_approved'):
+                results.append({'user_id': user_id, 'status': 'already_approved'})
+            else:
+                approved.append({
+                    'id': user['id'],
+                    'full_name': user['full_name'],
+                    'email': user['email'],
+                    'assessment_token': generate_assessment_token()
+                })
+        
+        if approved:
+            # Tokens differ per user; one statement updates only users still present,
+            # verified and unapproved (database/approve_users.sql), so nothing is re-created
+            update_result = supabase.rpc('approve_users', {
+                'approvals': [{'id': user['id'], 'assessment_token': user['assessment_token']} for user in approved]
+            }).execute()
+            
+            updated_ids = {str(user_id) for user_id in (update_result.data or [])}
+            for user in approved:
+                if str(user['id']) not in updated_ids:
+                    results.append({'user_id': str(user['id']), 'status': 'skipped'})
+            approved = [user for user in approved if str(user['id']) in updated_ids]
+        
+        if approved:
+            # Log the action
+            supabase.table('system_logs').insert([
+                {
+                    'user_id': user['id'],
+                    'action': 'user_approved',
+                    'details': {
+                        'approved_user': user['email'],
+                        'assessment_token_generated': True,
+                        'bulk': True
+                    }
+                }
+                for user in approved
+            ]).execute()
+        
+        app_url = os.getenv('APP_URL', 'https://datrix-business-intelligence.vercel.app')
+        emails_queued = email_service.send_approval_emails([
+            {
+                'email': user['email'],
+                'full_name': user['full_name'],
+                'assessment_token': user['assessment_token'],
+                'assessment_url': f"{app_url}/assessment?token={user['assessment_token']}"
+            }
+            for user in approved
+        ])
+        
+        for user, email_queued in zip(approved, emails_queued):
+            results.append({
+                'user_id': str(user['id']),
+                'status': 'approved',
+                'assessment_token': user['assessment_token'],
+                'email_queued': email_queued
+            })
+        
+        return jsonify({
+            'success': True,
+            'approved': len(approved),
+            'results': results
+        }), 200
+    
+    except Exception as e:
+        print(f"Bulk approve users error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @admin_bp.route('/reject-user/<user_id>', methods=['POST'])
 def reject_user(user_id):
     """Reject a user application"""
@@ -165,23 +275,29 @@ def get_dashboard_stats():
         if not supabase:
             return jsonify({'error': 'Database connection not available'}), 500
         
-        # Get stats from the view
+        # Get stats from the view (trigger-maintained counters, see database/dashboard_stats.sql)
         stats_result = supabase.table('admin_dashboard_stats').select('*').execute()
         
         if stats_result.data and len(stats_result.data) > 0:
             stats = stats_result.data[0]
         else:
-            # Fallback to manual counting
-            pending = supabase.table('users').select('id', count='exact').eq('status', 'pending').execute()
-            verified = supabase.table('users').select('id', count='exact').eq('status', 'verified').execute()
-            approved = supabase.table('users').select('id', count='exact').eq('status', 'approved').execute()
+            # Fallback to manual counting when the summary tables are not installed
+            pending = supabase.table('users').select('id', count='exact').eq('status', 'pending').limit(1).execute()
+            verified = supabase.table('users').select('id', count='exact').eq('status', 'verified').limit(1).execute()
+            approved = supabase.table('users').select('id', count='exact').eq('status', 'approved').limit(1).execute()
+            recent_assessments = supabase.table('assessments').select('id', count='exact').gte(
+                'completed_at', window_start(ASSESSMENTS_WINDOW_DAYS)
+            ).limit(1).execute()
+            new_users = supabase.table('users').select('id', count='exact').gte(
+                'created_at', window_start(NEW_USERS_WINDOW_DAYS)
+            ).limit(1).execute()
             
             stats = {
                 'pending_users': pending.count or 0,
                 'verified_users': verified.count or 0,
                 'approved_users': approved.count or 0,
-                'assessments_last_30_days': 0,
-                'new_users_last_7_days': 0
+                'assessments_last_30_days': recent_assessments.count or 0,
+                'new_users_last_7_days': new_users.count or 0
             }
         
         return jsonify({
@@ -195,23 +311,66 @@ def get_dashboard_stats():
 
 @admin_bp.route('/assessments', methods=['GET'])
 def get_all_assessments():
-    """Get all assessments with user information"""
+    """Get assessment summaries newest first, one keyset page at a time
+    
+    Query parameters: limit, cursor, expand (answers, category_scores,
+    insights, recommendations, user), grade, tier, from and to (created_at).
+    """
     try:
         supabase = get_service_client()
         if not supabase:
             return jsonify({'error': 'Database connection not available'}), 500
         
-        # Get assessments with user data
-        result = supabase.table('assessments').select(
-            '*, users(full_name, email, business_name)'
-        ).order('completed_at', desc=True).execute()
+        limit = parse_limit(request.args.get('limit'), ADMIN_PAGE_SIZE, ADMIN_MAX_PAGE_SIZE)
+        
+        columns = list(ASSESSMENT_SUMMARY_COLUMNS)
+        for field in filter(None, request.args.get('expand', '').split(',')):
+            field = field.strip()
+            if field not in ASSESSMENT_EXPANSIONS:
+                return jsonify({'error': f'Unknown expansion: {field}'}), 400
+            columns.append(ASSESSMENT_EXPANSIONS[field])
+        
+        # Ordered by (created_at, id) newest first, like the listing in main.py
+        query = supabase.table('assessments').select(', '.join(dict.fromkeys(columns)), count='exact')
+        
+        if request.args.get('grade'):
+            grades = [grade.strip().upper() for grade in request.args['grade'].split(',') if grade.strip()]
+            for grade in grades:
+                if grade not in ASSESSMENT_GRADES:
+                    return jsonify({'error': f'Unknown grade: {grade}'}), 400
+            query = query.in_('overall_grade', grades)
+        if request.args.get('tier'):
+            query = query.eq('performance_tier', request.args['tier'])
+        if request.args.get('from'):
+            query = query.gte(ADMIN_SORT_COLUMN, request.args['from'])
+        if request.args.get('to'):
+            query = query.lte(ADMIN_SORT_COLUMN, request.args['to'])
+        
+        if request.args.get('cursor'):
+            sort_value, assessment_id = decode_cursor(request.args['cursor'])
+            query = query.or_(
+                f'{ADMIN_SORT_COLUMN}.lt.{quote_value(sort_value)},'
+                f'and({ADMIN_SORT_COLUMN}.eq.{quote_value(sort_value)},id.lt.{quote_value(assessment_id)})'
+            )
+        
+        result = (query.order(ADMIN_SORT_COLUMN, desc=True)
+                  .order('id', desc=True).limit(limit + 1).execute())
+        
+        assessments = result.data or []
+        next_cursor = None
+        if len(assessments) > limit:
+            assessments = assessments[:limit]
+            next_cursor = encode_cursor(assessments[-1][ADMIN_SORT_COLUMN], assessments[-1]['id'])
         
         return jsonify({
             'success': True,
-            'assessments': result.data or [],
-            'count': len(result.data) if result.data else 0
+            'assessments': assessments,
+            'count': result.count if result.count is not None else len(assessments),
+            'next_cursor': next_cursor
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"Get assessments error: {str(e)}")
         return jsonify({'error': str(e)}), 500
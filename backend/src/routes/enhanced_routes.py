@@ -2,16 +2,30 @@
 Enhanced API routes for Datrix™ with professional reporting
 """
 
-from flask import Blueprint, request, jsonify, send_file
-from src.config.supabase_client import SupabaseClient
+from flask import Blueprint, Response, request, jsonify, send_file
+from src.config.supabase_client import get_supabase_client
 from src.services.report_generator import ReportGenerator
+from src.services.report_cache import get_report_cache, report_cache_key
+from src.services.pdf_store import get_pdf_store
+from src.services.pdf_jobs import get_render_queue, DONE, FAILED
+from src.services.report_export import stream_report_zip
+from src.services.keyset_pagination import iter_keyset_pages
 from src.models.enhanced_assessment import ENHANCED_ASSESSMENT_QUESTIONS
+import itertools
 import os
 import uuid
 from datetime import datetime
 
+# Legacy question and submit routes; src/main.py, the deployed entrypoint, serves
+# its own versions of these and does not mount enhanced_bp.
 enhanced_bp = Blueprint('enhanced', __name__)
-supabase = SupabaseClient()
+
+# Report, PDF and export routes, mounted by src/main.py
+report_bp = Blueprint('reports', __name__)
+supabase = get_supabase_client()
+
+# Assessments fetched per page during bulk export
+EXPORT_PAGE_SIZE = int(os.getenv('EXPORT_PAGE_SIZE', '100'))
 
 @enhanced_bp.route('/api/assessment/questions', methods=['GET'])
 def get_assessment_questions():
@@ -32,13 +46,13 @@ def submit_assessment():
         
         # Verify user
         if token:
-            user_result = supabase.query('users', {'assessment_token': token})
+            user_result = supabase.select('users', filters={'assessment_token': token}, use_service_key=True)
             if not user_result or len(user_result) == 0:
                 return jsonify({'success': False, 'error': 'Invalid token'}), 400
             user_data = user_result[0]
             user_id = user_data['id']
         else:
-            user_result = supabase.query('users', {'id': user_id})
+            user_result = supabase.select('users', filters={'id': user_id}, use_service_key=True)
             if not user_result or len(user_result) == 0:
                 return jsonify({'success': False, 'error': 'User not found'}), 404
             user_data = user_result[0]
@@ -73,10 +87,11 @@ def submit_assessment():
             'created_at': datetime.now().isoformat()
         }
         
-        supabase.insert('assessments', assessment_data)
+        result = supabase.insert('assessments', assessment_data, returning='minimal')
+        if 'error' in result:
+            return jsonify({'success': False, 'error': 'Failed to save assessment'}), 500
         
-        # Generate report data
-        report_data = ReportGenerator.generate_report_data(user_data, assessment_data)
+        report_data = prerender_report(user_data, assessment_data)
         
         return jsonify({
             'success': True,
@@ -89,63 +104,183 @@ def submit_assessment():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@enhanced_bp.route('/api/assessment/report/<assessment_id>/pdf', methods=['GET'])
+def prerender_report(user_data, assessment_data):
+    """Cache a new assessment's report data and start rendering its PDF in the background
+    
+    By the time the PDF is requested it is usually already in the artifact
+    store. Returns the report data.
+    """
+    report_data = ReportGenerator.generate_report_data(user_data, assessment_data)
+    cache_key = report_cache_key(assessment_data['id'], assessment_data.get('answers'))
+    get_report_cache().put(cache_key, report_data)
+    get_render_queue().enqueue(cache_key, report_data, report_download_name(report_data))
+    return report_data
+
+def get_assessment(assessment_id):
+    """Fetch a stored assessment, or None"""
+    assessment_result = supabase.select('assessments', filters={'id': assessment_id}, use_service_key=True)
+    return assessment_result[0] if assessment_result else None
+
+def report_download_name(report_data):
+    """Download filename for a report PDF"""
+    business_name = report_data['company_info']['name']
+    if business_name == 'N/A':
+        business_name = 'Company'
+    return f"Datrix_Report_{business_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+def job_response(job):
+    """Public view of a PDF render job"""
+    return {
+        'success': job['status'] != FAILED,
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'error': job['error'],
+        'status_url': f"/api/assessment/report/pdf/jobs/{job['job_id']}",
+        'result_url': f"/api/assessment/report/pdf/jobs/{job['job_id']}/result"
+    }
+
+def send_pdf_artifact(artifact_key, artifact):
+    """Send a stored PDF; conditional=True answers If-None-Match with 304 and honours Range
+    
+    The report holds contact details, so shared caches must not store it;
+    browsers keep a private copy and revalidate it with the ETag.
+    """
+    pdf_path, metadata = artifact
+    response = send_file(
+        pdf_path,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=metadata['download_name'],
+        conditional=True,
+        etag=artifact_key
+    )
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def load_report_data(assessment_data, cache_key):
+    """Get report data for an assessment, regenerating it only when its inputs change
+    
+    Returns (report_data, None) or (None, error_response).
+    """
+    report_cache = get_report_cache()
+    
+    report_data = report_cache.get(cache_key)
+    if report_data is None:
+        user_result = supabase.select('users', filters={'id': assessment_data['user_id']}, use_service_key=True)
+        if not user_result or len(user_result) == 0:
+            return None, (jsonify({'success': False, 'error': 'User not found'}), 404)
+        
+        report_data = ReportGenerator.generate_report_data(user_result[0], assessment_data)
+        report_cache.put(cache_key, report_data)
+    
+    return report_data, None
+
+@report_bp.route('/api/assessment/report/<assessment_id>/pdf', methods=['GET'])
 def download_pdf_report(assessment_id):
-    """Generate and download PDF report"""
+    """Download PDF report, rendering it once per assessment and report version
+    
+    Answers 202 with the job's status and result URLs while the PDF renders.
+    """
     try:
-        # Get assessment
-        assessment_result = supabase.query('assessments', {'id': assessment_id})
-        if not assessment_result or len(assessment_result) == 0:
+        assessment_data = get_assessment(assessment_id)
+        if not assessment_data:
             return jsonify({'success': False, 'error': 'Assessment not found'}), 404
         
-        assessment_data = assessment_result[0]
+        # Same content address as the report cache: assessment, answers and report version
+        artifact_key = report_cache_key(assessment_id, assessment_data.get('answers'))
+        pdf_store = get_pdf_store()
+        artifact = pdf_store.get(artifact_key)
         
-        # Get user data
-        user_result = supabase.query('users', {'id': assessment_data['user_id']})
-        if not user_result or len(user_result) == 0:
-            return jsonify({'success': False, 'error': 'User not found'}), 404
+        if artifact is None:
+            report_data, error = load_report_data(assessment_data, artifact_key)
+            if error:
+                return error
+            
+            # Never block the request on a render; the client polls the job instead
+            render_queue = get_render_queue()
+            download_name = report_download_name(report_data)
+            job = render_queue.enqueue(artifact_key, report_data, download_name)
+            
+            if job['status'] == FAILED:
+                return jsonify(job_response(job)), 500
+            if job['status'] == DONE:
+                artifact = pdf_store.get(artifact_key)
+                if artifact is None:
+                    # Evicted or expired since the job finished; render it again
+                    job = render_queue.enqueue(artifact_key, report_data, download_name)
+                    if job['status'] == FAILED:
+                        return jsonify(job_response(job)), 500
+                    if job['status'] == DONE:
+                        artifact = pdf_store.get(artifact_key)
+            if artifact is None:
+                return jsonify(job_response(job)), 202
         
-        user_data = user_result[0]
+        return send_pdf_artifact(artifact_key, artifact)
         
-        # Generate report data
-        report_data = ReportGenerator.generate_report_data(user_data, assessment_data)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@report_bp.route('/api/assessment/report/<assessment_id>/pdf/jobs', methods=['POST'])
+def enqueue_pdf_report(assessment_id):
+    """Queue a PDF report for background rendering"""
+    try:
+        assessment_data = get_assessment(assessment_id)
+        if not assessment_data:
+            return jsonify({'success': False, 'error': 'Assessment not found'}), 404
         
-        # Generate PDF
-        pdf_filename = f"Datrix_Report_{user_data.get('business_name', 'Company').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        pdf_path = f"/tmp/{pdf_filename}"
+        artifact_key = report_cache_key(assessment_id, assessment_data.get('answers'))
+        report_data, error = load_report_data(assessment_data, artifact_key)
+        if error:
+            return error
         
-        pdf_generator.generate_pdf(report_data, pdf_path)
+        job = get_render_queue().enqueue(artifact_key, report_data, report_download_name(report_data))
+        return jsonify(job_response(job)), 200 if job['status'] == DONE else 202
         
-        return send_file(
-            pdf_path,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=pdf_filename
-        )
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@report_bp.route('/api/assessment/report/pdf/jobs/<job_id>', methods=['GET'])
+def get_pdf_job_status(job_id):
+    """Poll a PDF render job"""
+    job = get_render_queue().status(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify(job_response(job))
+
+@report_bp.route('/api/assessment/report/pdf/jobs/<job_id>/result', methods=['GET'])
+def get_pdf_job_result(job_id):
+    """Download the PDF produced by a render job"""
+    try:
+        job = get_render_queue().status(job_id)
+        if not job:
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
+        if job['status'] == FAILED:
+            return jsonify(job_response(job)), 500
+        if job['status'] != DONE:
+            return jsonify(job_response(job)), 202
+        
+        artifact = get_pdf_store().get(job['artifact_key'])
+        if artifact is None:
+            return jsonify({'success': False, 'error': 'Report expired, please request it again'}), 410
+        
+        return send_pdf_artifact(job['artifact_key'], artifact)
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@enhanced_bp.route('/api/assessment/report/<assessment_id>', methods=['GET'])
+@report_bp.route('/api/assessment/report/<assessment_id>', methods=['GET'])
 def get_report_data(assessment_id):
     """Get report data for web display"""
     try:
-        # Get assessment
-        assessment_result = supabase.query('assessments', {'id': assessment_id})
-        if not assessment_result or len(assessment_result) == 0:
+        assessment_data = get_assessment(assessment_id)
+        if not assessment_data:
             return jsonify({'success': False, 'error': 'Assessment not found'}), 404
         
-        assessment_data = assessment_result[0]
-        
-        # Get user data
-        user_result = supabase.query('users', {'id': assessment_data['user_id']})
-        if not user_result or len(user_result) == 0:
-            return jsonify({'success': False, 'error': 'User not found'}), 404
-        
-        user_data = user_result[0]
-        
-        # Generate report data
-        report_data = ReportGenerator.generate_report_data(user_data, assessment_data)
+        cache_key = report_cache_key(assessment_id, assessment_data.get('answers'))
+        report_data, error = load_report_data(assessment_data, cache_key)
+        if error:
+            return error
         
         return jsonify({
             'success': True,
@@ -154,3 +289,67 @@ def get_report_data(assessment_id):
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+
+def iter_export_assessments(date_from=None, date_to=None, tier=None, business_type=None):
+    """Page through assessments matching the export filters, with their users embedded
+    
+    Pages are keyset ranges on (completed_at, id), so rows written during
+    the export are neither skipped nor repeated. A failed page fetch raises
+    instead of ending the export early.
+    """
+    filters = [('completed_at', 'not.is.null')]
+    if date_from:
+        filters.append(('completed_at', f'gte.{date_from}'))
+    if date_to:
+        filters.append(('completed_at', f'lte.{date_to}'))
+    if tier:
+        filters.append(('performance_tier', f'eq.{tier}'))
+    if business_type:
+        filters.append(('users.business_type', f'eq.{business_type}'))
+    
+    return iter_keyset_pages(
+        supabase, 'assessments',
+        ['*', 'users!inner(full_name,designation,email,mobile,business_name,business_type)'],
+        filters=filters,
+        sort_column='completed_at',
+        descending=False,
+        page_size=EXPORT_PAGE_SIZE
+    )
+
+def export_report_item(assessment):
+    """(zip entry name, report data, PDF artifact key) for one exported assessment"""
+    user_data = assessment.pop('users', None) or {}
+    cache_key = report_cache_key(assessment['id'], assessment.get('answers'))
+    report_data = get_report_cache().get_or_generate(
+        cache_key,
+        lambda: ReportGenerator.generate_report_data(user_data, assessment)
+    )
+    return f"{str(assessment['id'])[:8]}_{report_download_name(report_data)}", report_data, cache_key
+
+@report_bp.route('/api/admin/reports/export', methods=['GET'])
+def export_pdf_reports():
+    """Stream the PDF reports for all matching assessments as one ZIP
+    
+    Query parameters: from, to (completed_at dates), tier, business_type.
+    """
+    try:
+        pages = iter_export_assessments(
+            date_from=request.args.get('from'),
+            date_to=request.args.get('to'),
+            tier=request.args.get('tier'),
+            business_type=request.args.get('business_type')
+        )
+        
+        # Fetch the first page up front so an unreachable database is a 500, not an empty ZIP
+        pages = itertools.chain([next(pages, [])], pages)
+        
+        archive_name = f"Datrix_Reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        
+        return Response(
+            stream_report_zip(pages, export_report_item, get_render_queue()),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename={archive_name}'}
+        )
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
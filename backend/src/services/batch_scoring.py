@@ -0,0 +1,436 @@
+"""
+Datrix™ Business Intelligence Scanner
+Vectorized batch rescoring of stored assessments
+"""
+
+import json
+import sys
+import threading
+from collections.abc import Hashable
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from src.config.supabase_client import SupabaseClient, get_supabase_client
+from src.models.enhanced_assessment import ASSESSMENT_FRAMEWORK, SCORING_TABLE, SCORING_SYSTEM
+from src.services.question_catalog import CatalogSnapshot, QuestionCatalog
+
+# Overall grade and performance tier stored with an assessment, by minimum percentage.
+# assessments.overall_grade is constrained to these grades (database/rescore_assessments.sql)
+GRADE_BANDS = (
+    (85, 'A', 'World Class'),
+    (75, 'B', 'Industry Leader'),
+    (65, 'C', 'Competitive'),
+    (50, 'D', 'Developing'),
+    (0, 'F', 'Emerging')
+)
+
+# Every overall_grade an assessment can be stored with, best first
+GRADES = tuple(grade for _, grade, _ in GRADE_BANDS)
+
+def grade_and_tier(percentage: float) -> Tuple[str, str]:
+    """Stored overall_grade and performance_tier for a percentage"""
+    for minimum, grade, tier in GRADE_BANDS:
+        if percentage >= minimum:
+            return grade, tier
+    return GRADE_BANDS[-1][1], GRADE_BANDS[-1][2]
+
+class BatchScorer:
+    """Score many answer sets at once with NumPy array operations
+
+    Answers are encoded into an (assessments x questions) score matrix and a
+    matching answered mask. Totals, pillar scores, percentages and grades are
+    then computed for the whole batch at once, giving the same results as
+    calculate_assessment_score row by row.
+    """
+
+    def __init__(self, scoring_table: Dict = None, pillar_names: Dict[str, str] = None):
+        table = scoring_table or SCORING_TABLE
+        self.pillar_names = pillar_names or {
+            pillar["id"]: pillar["name"] for pillar in ASSESSMENT_FRAMEWORK["pillars"]
+        }
+        self.questions = table["questions"]
+        self.question_ids = list(self.questions)
+        self.columns = {q_id: i for i, q_id in enumerate(self.question_ids)}
+        self.pillars = list(table["pillar_max"])
+
+        pillar_index = {pillar: i for i, pillar in enumerate(self.pillars)}
+        self.question_max = np.array(
+            [self.questions[q_id]["max"] for q_id in self.question_ids], dtype=np.int64
+        )
+        self.pillar_matrix = np.zeros((len(self.question_ids), len(self.pillars)), dtype=np.int64)
+        for q_id, column in self.columns.items():
+            self.pillar_matrix[column, pillar_index[self.questions[q_id]["pillar"]]] = 1
+
+        self.grades = list(SCORING_SYSTEM["grades"].items())
+
+    def is_valid_answer(self, q_id: str, answer) -> bool:
+        """Whether a stored answer has the shape its question type expects
+
+        single_choice answers are one option value and multiple_choice
+        answers a list of option values. Unknown options are still valid
+        and score nothing.
+        """
+        question = self.questions.get(q_id)
+        if question is None:
+            return True
+        if question["type"] == "single_choice":
+            return isinstance(answer, Hashable)
+        if question["type"] == "multiple_choice":
+            return isinstance(answer, list) and all(isinstance(selected, Hashable) for selected in answer)
+        return True
+
+    def is_well_formed(self, answers) -> bool:
+        """Whether every answer of a stored answer set can be encoded"""
+        if answers is None:
+            return True
+        if not isinstance(answers, dict):
+            return False
+        return all(self.is_valid_answer(q_id, answer) for q_id, answer in answers.items())
+
+    def encode(self, answer_sets: List[Dict]):
+        """Encode answer dicts as (scores, answered) matrices
+
+        Malformed answers (see is_valid_answer) are left unanswered.
+        """
+        scores = np.zeros((len(answer_sets), len(self.question_ids)), dtype=np.int64)
+        answered = np.zeros(scores.shape, dtype=bool)
+
+        for row, answers in enumerate(answer_sets):
+            for q_id, answer in (answers or {}).items():
+                column = self.columns.get(q_id)
+                if column is None:
+                    continue
+
+                question = self.questions[q_id]
+                option_scores = question["scores"]
+
+                if not self.is_valid_answer(q_id, answer):
+                    continue
+
+                if question["type"] == "single_choice":
+                    if answer not in option_scores:
+                        continue
+                    scores[row, column] = option_scores[answer]
+                elif question["type"] == "multiple_choice":
+                    scores[row, column] = sum(option_scores.get(selected, 0) for selected in answer)
+                else:
+                    continue
+
+                answered[row, column] = True
+
+        return scores, answered
+
+    def grade(self, percentage: np.ndarray) -> np.ndarray:
+        """Vectorized SCORING_SYSTEM grade lookup (first matching band wins)"""
+        conditions = [(percentage >= c["min"]) & (percentage <= c["max"]) for _, c in self.grades]
+        return np.select(conditions, [g for g, _ in self.grades], default="F")
+
+    def score(self, answer_sets: List[Dict]) -> Dict[str, np.ndarray]:
+        """Score a batch of answer dicts"""
+        scores, answered = self.encode(answer_sets)
+        answered_max = answered * self.question_max
+
+        total_score = scores.sum(axis=1)
+        max_possible = answered_max.sum(axis=1)
+        # Same operation order as calculate_assessment_score: total / max * 100
+        percentage = np.divide(
+            total_score, max_possible,
+            out=np.zeros(len(answer_sets)), where=max_possible > 0
+        ) * 100
+
+        return {
+            "total_score": total_score,
+            "max_possible": max_possible,
+            "percentage": percentage,
+            "grade": self.grade(percentage),
+            "pillar_score": scores @ self.pillar_matrix,
+            "pillar_max": answered_max @ self.pillar_matrix,
+            "pillar_answered": (answered @ self.pillar_matrix) > 0
+        }
+
+    def results(self, answer_sets: List[Dict]) -> List[Dict]:
+        """Score a batch and return calculate_assessment_score-shaped dicts"""
+        batch = self.score(answer_sets)
+        results = []
+
+        for row in range(len(answer_sets)):
+            pillar_scores = {
+                pillar: {
+                    "score": int(batch["pillar_score"][row, i]),
+                    "max": int(batch["pillar_max"][row, i])
+                }
+                for i, pillar in enumerate(self.pillars)
+                if batch["pillar_answered"][row, i]
+            }
+            results.append({
+                "total_score": int(batch["total_score"][row]),
+                "max_possible": int(batch["max_possible"][row]),
+                "percentage": round(float(batch["percentage"][row]), 2),
+                "grade": str(batch["grade"][row]),
+                "pillar_scores": pillar_scores
+            })
+
+        return results
+
+    def is_scorable(self, answers: Optional[Dict]) -> bool:
+        """Whether an answer set is well formed and uses any question id of the scoring table"""
+        return self.is_well_formed(answers) and any(q_id in self.columns for q_id in (answers or {}))
+
+    def rescore_rows(self, assessments: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Score column updates for a batch of stored rows
+
+        Rows whose answers contain no question id of the scoring table (for
+        example answers keyed by question UUID) or a malformed answer cannot
+        be rescored and are returned separately, untouched. category_scores keeps the stored
+        {name: {score, max_score, percentage}} shape and the grade and tier
+        use the same bands as the submit endpoint.
+
+        Returns (updates, skipped rows); each update is {'id', 'fields'}.
+        """
+        scorable = [a for a in assessments if self.is_scorable(a.get("answers"))]
+        skipped = [a for a in assessments if not self.is_scorable(a.get("answers"))]
+        updates = []
+
+        for assessment, result in zip(scorable, self.results([a["answers"] for a in scorable])):
+            category_scores = {
+                self.pillar_names.get(pillar, pillar): {
+                    "score": scores["score"],
+                    "max_score": scores["max"],
+                    "percentage": round(scores["score"] / scores["max"] * 100, 2) if scores["max"] > 0 else 0
+                }
+                for pillar, scores in result["pillar_scores"].items()
+            }
+            grade, tier = grade_and_tier(result["percentage"])
+            updates.append({
+                "id": assessment["id"],
+                "fields": {
+                    "total_score": result["total_score"],
+                    "max_score": result["max_possible"],
+                    "percentage": result["percentage"],
+                    "overall_grade": grade,
+                    "performance_tier": tier,
+                    "category_scores": category_scores
+                }
+            })
+
+        return updates, skipped
+
+
+class CatalogScorer:
+    """Score answer sets keyed by question UUID against the question catalogue
+
+    This is how submit_assessment in main.py stores answers: each value is
+    the response score itself. Scores are summed per category with one
+    matrix product, and each category's maximum is the max_score of all its
+    questions, answered or not, as on submit.
+    """
+
+    def __init__(self, catalog: CatalogSnapshot):
+        self.categories = catalog.categories
+        self.columns = {question['id']: i for i, question in enumerate(catalog.questions)}
+
+        category_index = {category['id']: i for i, category in enumerate(self.categories)}
+        self.category_matrix = np.zeros((len(self.columns), len(self.categories)))
+        for question in catalog.questions:
+            column = category_index.get(question['category_id'])
+            if column is not None:
+                self.category_matrix[self.columns[question['id']], column] = 1
+        self.category_max = np.array(
+            [catalog.category_max_scores[category['id']] for category in self.categories], dtype=float
+        )
+
+    @staticmethod
+    def is_valid_answer(answer) -> bool:
+        return isinstance(answer, (int, float)) and not isinstance(answer, bool)
+
+    def is_scorable(self, answers) -> bool:
+        """Whether an answer set uses catalogue question ids and every such answer is a number"""
+        if not isinstance(answers, dict):
+            return False
+        known = [answer for q_id, answer in answers.items() if q_id in self.columns]
+        return bool(known) and all(self.is_valid_answer(answer) for answer in known)
+
+    def rescore_rows(self, assessments: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Score column updates for rows of catalogue-keyed answers; see BatchScorer.rescore_rows"""
+        scorable = [a for a in assessments if self.is_scorable(a.get("answers"))]
+        skipped = [a for a in assessments if not self.is_scorable(a.get("answers"))]
+
+        values = np.zeros((len(scorable), len(self.columns)))
+        for row, assessment in enumerate(scorable):
+            for q_id, answer in assessment["answers"].items():
+                column = self.columns.get(q_id)
+                if column is not None:
+                    values[row, column] = answer
+
+        category_score = values @ self.category_matrix
+        total_score = category_score.sum(axis=1)
+        max_possible = self.category_max.sum()
+
+        updates = []
+        for row, assessment in enumerate(scorable):
+            category_scores = {}
+            for i, category in enumerate(self.categories):
+                score, category_max = category_score[row, i], self.category_max[i]
+                category_scores[category['name']] = {
+                    "score": as_number(score),
+                    "max_score": as_number(category_max),
+                    "percentage": round(float(score / category_max * 100), 2) if category_max > 0 else 0
+                }
+            percentage = float(total_score[row] / max_possible * 100) if max_possible > 0 else 0
+            grade, tier = grade_and_tier(percentage)
+            updates.append({
+                "id": assessment["id"],
+                "fields": {
+                    "total_score": as_number(total_score[row]),
+                    "max_score": as_number(max_possible),
+                    "percentage": round(percentage, 2),
+                    "overall_grade": grade,
+                    "performance_tier": tier,
+                    "category_scores": category_scores
+                }
+            })
+
+        return updates, skipped
+
+
+def as_number(value: float):
+    """A NumPy sum as an int when it is whole, as the submit endpoint stores it"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def iter_assessment_pages(client: SupabaseClient, page_size: int = 1000) -> Iterator[List[Dict]]:
+    """Page through stored assessments by id (keyset pagination)"""
+    last_id = None
+
+    while True:
+        query = (client.query('assessments', use_service_key=True)
+                 .select('id', 'user_id', 'answers')
+                 .order('id')
+                 .limit(page_size))
+        if last_id is not None:
+            query.gt('id', last_id)
+
+        result = query.execute()
+        if result.error:
+            raise RuntimeError(f'Failed to fetch assessments: {result.status} {result.error}')
+
+        page = result.data
+        if not page:
+            return
+
+        yield page
+        last_id = page[-1]['id']
+
+        if len(page) < page_size:
+            return
+
+
+def rescore_assessments(client: SupabaseClient, scoring_table: Dict = None,
+                        page_size: int = 1000, pages: Iterable[List[Dict]] = None,
+                        derive: Callable[[Dict, float], Dict] = None,
+                        catalog: CatalogSnapshot = None) -> Dict:
+    """Rescore every stored assessment and write the score columns back
+
+    Each page is scored as one matrix and written back with one call to the
+    apply_assessment_scores function (database/rescore_assessments.sql),
+    which updates the score columns of rows that still exist. The answers
+    JSONB is not sent back and a row deleted during the scan stays deleted.
+
+    Rows keyed by framework question id are scored with BatchScorer and
+    rows keyed by question UUID (written by main.py) with CatalogScorer
+    against `catalog`, loaded from Supabase when not given. For the latter,
+    derive(category scores, percentage) may return insights and
+    recommendations to refresh as well; framework rows keep theirs, since
+    their category names are pillar names.
+
+    This scans the whole table; run it from run_rescore_job() or the
+    command line rather than inside a web request.
+    """
+    scorer = BatchScorer(scoring_table)
+    catalog_scorer = CatalogScorer(catalog or QuestionCatalog(client).refresh())
+    summary = {'scanned': 0, 'updated': 0, 'skipped': 0, 'missing': 0, 'failed': []}
+
+    if pages is None:
+        pages = iter_assessment_pages(client, page_size)
+
+    for page in pages:
+        framework_updates, unscored = scorer.rescore_rows(page)
+        catalog_updates, skipped = catalog_scorer.rescore_rows(unscored)
+        summary['scanned'] += len(page)
+        summary['skipped'] += len(skipped)
+        if not framework_updates and not catalog_updates:
+            continue
+
+        rows = [{'id': update['id'], **update['fields']} for update in framework_updates]
+        for update in catalog_updates:
+            fields = update['fields']
+            if derive is not None:
+                fields = {**fields, **derive(fields['category_scores'], fields['percentage'])}
+            rows.append({'id': update['id'], **fields})
+
+        result = client.rpc('apply_assessment_scores', {'updates': rows}, use_service_key=True)
+        error = None
+        if isinstance(result, dict) and 'error' in result:
+            error = f"{result.get('status')}: {result['error']}"
+
+        if error:
+            print(f"Rescore write failed for assessments {rows[0]['id']}..{rows[-1]['id']}: {error}")
+            summary['failed'].append({
+                'first_id': rows[0]['id'],
+                'last_id': rows[-1]['id'],
+                'rows': len(rows),
+                'error': error
+            })
+        else:
+            updated = int(result or 0)
+            summary['updated'] += updated
+            summary['missing'] += len(rows) - updated
+
+    return summary
+
+
+_rescore_lock = threading.Lock()
+
+def run_rescore_job(client: SupabaseClient, **options) -> bool:
+    """Start rescore_assessments on a background thread
+
+    Returns False if a rescore is already running in this process. The
+    summary is logged when the job finishes. Serverless platforms such as
+    Vercel stop the process once the response is sent, so there the
+    rescore should be run from the command line instead:
+
+        python -m src.services.batch_scoring --page-size 1000
+    """
+    if not _rescore_lock.acquire(blocking=False):
+        return False
+
+    def run():
+        try:
+            summary = rescore_assessments(client, **options)
+            print(f"Rescore finished: {json.dumps(summary, default=str)}")
+        except Exception as e:
+            print(f"Rescore failed: {str(e)}")
+        finally:
+            _rescore_lock.release()
+
+    threading.Thread(target=run, name='assessment-rescore', daemon=True).start()
+    return True
+
+
+if __name__ == '__main__':
+    import argparse
+    from src.main import generate_insights, generate_recommendations
+
+    parser = argparse.ArgumentParser(description='Rescore every stored assessment')
+    parser.add_argument('--page-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    summary = rescore_assessments(
+        get_supabase_client(), page_size=args.page_size,
+        derive=lambda category_scores, percentage: {
+            'insights': generate_insights(category_scores, percentage),
+            'recommendations': generate_recommendations(category_scores)
+        }
+    )
+    print(json.dumps(summary, indent=2, default=str))
+    sys.exit(1 if summary['failed'] else 0)
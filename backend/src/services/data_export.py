@@ -0,0 +1,63 @@
+"""
+Datrix™ Business Intelligence Scanner
+Streaming NDJSON and CSV serialisation for admin data exports
+"""
+
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+# Fields stored for each category in assessments.category_scores
+CATEGORY_SCORE_FIELDS = ('score', 'max_score', 'percentage')
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+def category_score_columns(category_names: Sequence[str]) -> List[str]:
+    """Flat column names for the category_scores of the given categories"""
+    return [
+        f'category_scores.{name}.{field}'
+        for name in category_names
+        for field in CATEGORY_SCORE_FIELDS
+    ]
+
+def flatten_category_scores(row: Dict) -> Dict:
+    """Replace the category_scores JSONB of a row with one column per category field"""
+    category_scores = row.pop('category_scores', None) or {}
+    for name, scores in category_scores.items():
+        for field in CATEGORY_SCORE_FIELDS:
+            row[f'category_scores.{name}.{field}'] = (scores or {}).get(field)
+    return row
+
+def iter_ndjson(pages: Iterable[List[Dict]]) -> Iterator[str]:
+    """One JSON object per line, yielded a page at a time"""
+    for page in pages:
+        yield ''.join(json.dumps(row, default=str, ensure_ascii=False) + '\n' for row in page)
+
+def iter_csv(pages: Iterable[List[Dict]], fieldnames: Sequence[str]) -> Iterator[str]:
+    """CSV with a header row, yielded a page at a time
+
+    Keys outside fieldnames are dropped, so the column set is fixed before
+    the first row is read.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+
+    writer.writeheader()
+    for page in pages:
+        writer.writerows(page)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def iter_export(pages: Iterable[List[Dict]], export_format: str, fieldnames: Sequence[str]) -> Iterator[str]:
+    """Serialise pages as NDJSON or CSV"""
+    if export_format == 'csv':
+        return iter_csv(pages, fieldnames)
+    return iter_ndjson(pages)
@@ -3,14 +3,109 @@ Datrix™ Business Intelligence Scanner
 Email Service for sending notifications
 """
 
+import json
 import os
+import queue
 import smtplib
+import threading
+import time
+from collections import deque
+from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Dict, List, Optional
+from src.services.email_templates import get_email_templates
+
+class SMTPConnectionPool:
+    """Pool of logged-in SMTP connections reused across messages
+    
+    Connections that have been idle longer than idle_timeout are checked
+    with NOOP before reuse and replaced if the server has dropped them.
+    """
+    
+    def __init__(self, host: str, port: int, user: str, password: str,
+                 max_connections: int = 2, idle_timeout: float = 60, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+    
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        server.starttls()
+        server.login(self.user, self.password)
+        return server
+    
+    def _is_alive(self, server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+    
+    def acquire(self) -> smtplib.SMTP:
+        """Get a healthy connection, blocking while all connections are busy"""
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    server, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if time.time() - last_used < self.idle_timeout or self._is_alive(server):
+                    return server
+                self._close(server)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, server: smtplib.SMTP, discard: bool = False):
+        """Return a connection to the pool, or close it if it is broken"""
+        if discard:
+            self._close(server)
+        else:
+            self._idle.put((server, time.time()))
+        self._slots.release()
+    
+    def close(self):
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
 
 class EmailService:
-    """Email service for sending notifications"""
+    """Email service for sending notifications
+    
+    send_email delivers synchronously over a pooled SMTP connection.
+    By default queue_email hands the message to background workers that
+    retry with exponential backoff, so request handlers never wait on SMTP.
+    Setting EMAIL_BACKGROUND=false opts into sending in the caller instead.
+    Undeliverable messages are kept in a bounded dead-letter store either
+    way.
+    
+    Background mode needs a long-lived process (gunicorn, flask run). On
+    serverless platforms worker threads and retry timers are frozen or
+    killed once the response is returned, so the Vercel deployment in
+    vercel.json turns it off.
+    """
     
     def __init__(self):
         self.smtp_host = os.getenv('SMTP_HOST', 'smtp.gmail.com')
@@ -20,31 +115,79 @@ class EmailService:
         self.from_email = os.getenv('FROM_EMAIL', self.smtp_user)
         self.from_name = os.getenv('FROM_NAME', 'Datrix™ Business Intelligence')
         
+        self.pool = SMTPConnectionPool(
+            self.smtp_host, self.smtp_port, self.smtp_user, self.smtp_password,
+            max_connections=int(os.getenv('SMTP_POOL_SIZE', '2')),
+            idle_timeout=float(os.getenv('SMTP_IDLE_TIMEOUT', '60'))
+        )
+        self.worker_count = int(os.getenv('EMAIL_WORKERS', '2'))
+        self.max_attempts = int(os.getenv('EMAIL_MAX_ATTEMPTS', '5'))
+        self.retry_backoff = float(os.getenv('EMAIL_RETRY_BACKOFF', '2'))
+        self.background = os.getenv('EMAIL_BACKGROUND', 'true').lower() in ('1', 'true', 'yes')
+        self.dead_letter_path = os.getenv('EMAIL_DEAD_LETTER_FILE', '')
+        self.dead_letter_limit = int(os.getenv('EMAIL_DEAD_LETTER_LIMIT', '1000'))
+        self.dead_letters = deque(maxlen=self.dead_letter_limit)
+        # Most messages a request may send inline when background mode is off
+        self.sync_batch_limit = int(os.getenv('EMAIL_SYNC_BATCH_LIMIT', '20'))
+        
+        # Compiled once per process and shared by every send
+        self.templates = get_email_templates()
+        
+        self._queue = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._workers_lock = threading.Lock()
+    
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.smtp_user and self.smtp_password)
+    
+    def _build_message(self, to_email: str, subject: str, html_body: str, text_body: str = None) -> MIMEMultipart:
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        
+        # Add text and HTML parts
+        if text_body:
+            part1 = MIMEText(text_body, 'plain')
+            msg.attach(part1)
+        
+        part2 = MIMEText(html_body, 'html')
+        msg.attach(part2)
+        return msg
+    
+    def _deliver(self, msg: MIMEMultipart):
+        """Send over a pooled connection, reconnecting once if it was dropped"""
+        for attempt in range(2):
+            server = self.pool.acquire()
+            try:
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self.pool.release(server, discard=True)
+                if attempt:
+                    raise
+                continue
+            except smtplib.SMTPException:
+                # The server answered (e.g. recipient refused); resending would deliver twice
+                self.pool.release(server)
+                raise
+            except OSError:
+                # SMTPException subclasses OSError, so plain socket errors are handled last
+                self.pool.release(server, discard=True)
+                if attempt:
+                    raise
+                continue
+            self.pool.release(server)
+            return
+    
     def send_email(self, to_email: str, subject: str, html_body: str, text_body: str = None) -> bool:
         """Send an email"""
         try:
-            if not self.smtp_user or not self.smtp_password:
+            if not self.is_configured:
                 print("Email service not configured - skipping email send")
                 return False
             
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            
-            # Add text and HTML parts
-            if text_body:
-                part1 = MIMEText(text_body, 'plain')
-                msg.attach(part1)
-            
-            part2 = MIMEText(html_body, 'html')
-            msg.attach(part2)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            self._deliver(self._build_message(to_email, subject, html_body, text_body))
             
             print(f"✓ Email sent successfully to {to_email}")
             return True
@@ -53,149 +196,232 @@ class EmailService:
             print(f"Failed to send email to {to_email}: {str(e)}")
             return False
     
-    def send_verification_email(self, to_email: str, full_name: str, verification_code: str) -> bool:
-        """Send verification code email"""
-        subject = "Verify Your Datrix™ Account"
-        
-        html_body = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .code-box {{ background: white; border: 2px dashed #667eea; padding: 20px; text-align: center; margin: 20px 0; border-radius: 8px; }}
-                .code {{ font-size: 32px; font-weight: bold; color: #667eea; letter-spacing: 5px; }}
-                .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-                .button {{ background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 20px 0; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>Datrix™</h1>
-                    <p>Business Intelligence Scanner</p>
-                </div>
-                <div class="content">
-                    <h2>Hello {full_name},</h2>
-                    <p>Thank you for registering with Datrix™ Business Intelligence Scanner!</p>
-                    <p>Please use the verification code below to complete your registration:</p>
-                    
-                    <div class="code-box">
-                        <div class="code">{verification_code}</div>
-                    </div>
-                    
-                    <p><strong>Important:</strong></p>
-                    <ul>
-                        <li>This code is valid for 30 minutes</li>
-                        <li>Do not share this code with anyone</li>
-                        <li>After verification, your account will be reviewed by our admin team</li>
-                    </ul>
-                    
-                    <p>If you didn't request this verification, please ignore this email.</p>
-                    
-                    <div class="footer">
-                        <p>© 2025 Navvi Corporation. All rights reserved.</p>
-                        <p>This is an automated email. Please do not reply.</p>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    # ------------------------------------------------------------------
+    # Background outbound queue
+    # ------------------------------------------------------------------
+    
+    def _start_workers(self):
+        with self._workers_lock:
+            if self._workers:
+                return
+            for i in range(max(self.worker_count, 1)):
+                worker = threading.Thread(target=self._worker, name=f'email-worker-{i}', daemon=True)
+                worker.start()
+                self._workers.append(worker)
+    
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        """5xx replies (bad recipient, rejected content, auth) will not succeed on retry"""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return True
+        code = getattr(error, 'smtp_code', None)
+        return isinstance(code, int) and 500 <= code < 600
+    
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._process(job)
+            finally:
+                self._queue.task_done()
+    
+    def _process(self, job: Dict) -> bool:
+        """Attempt a job once; returns True if every message in it was sent"""
+        if 'batch' in job:
+            return all(self._process_batch(job['batch']))
         
-        text_body = f"""
-        Hello {full_name},
+        job['attempts'] += 1
+        try:
+            self._deliver(self._build_message(job['to_email'], job['subject'], job['html_body'], job['text_body']))
+            print(f"✓ Email sent successfully to {job['to_email']}")
+            return True
+        except Exception as e:
+            self._retry_or_dead_letter(job, e)
+            return False
+    
+    def _process_batch(self, jobs: List[Dict]) -> List[bool]:
+        """Send a batch over one pooled connection; failed messages retry on their own
         
-        Thank you for registering with Datrix™ Business Intelligence Scanner!
+        A dropped session is replaced with a fresh connection and the
+        message that hit it is resent once, as in _deliver, so one stale
+        connection does not fail the rest of the batch. Returns whether
+        each message was sent, in order.
+        """
+        sent = []
+        server = None
+        for index, job in enumerate(jobs):
+            job['attempts'] += 1
+            msg = self._build_message(job['to_email'], job['subject'], job['html_body'], job['text_body'])
+            for attempt in range(2):
+                if server is None:
+                    try:
+                        server = self.pool.acquire()
+                    except Exception as e:
+                        # No connection to be had; every unsent message retries on its own
+                        self._retry_or_dead_letter(job, e)
+                        for pending in jobs[index + 1:]:
+                            pending['attempts'] += 1
+                            self._retry_or_dead_letter(pending, e)
+                        return sent + [False] * (len(jobs) - index)
+                try:
+                    server.send_message(msg)
+                except smtplib.SMTPServerDisconnected as e:
+                    error = e
+                except smtplib.SMTPException as e:
+                    # The server answered (e.g. recipient refused); the session is still usable
+                    self._retry_or_dead_letter(job, e)
+                    sent.append(False)
+                    break
+                except OSError as e:
+                    # SMTPException subclasses OSError, so plain socket errors are handled last
+                    error = e
+                else:
+                    print(f"✓ Email sent successfully to {job['to_email']}")
+                    sent.append(True)
+                    break
+                
+                self.pool.release(server, discard=True)
+                server = None
+                if attempt:
+                    self._retry_or_dead_letter(job, error)
+                    sent.append(False)
         
-        Your verification code is: {verification_code}
+        if server is not None:
+            self.pool.release(server)
+        return sent
+    
+    def _retry_or_dead_letter(self, job: Dict, error: Exception):
+        job['last_error'] = str(error)
+        # Without background workers there is nothing to run a delayed retry
+        if not self.background or self._is_permanent(error) or job['attempts'] >= self.max_attempts:
+            self._dead_letter(job)
+            return
         
-        This code is valid for 30 minutes. Please do not share it with anyone.
+        delay = self.retry_backoff * (2 ** (job['attempts'] - 1))
+        print(f"Email to {job['to_email']} failed (attempt {job['attempts']}), retrying in {delay:.0f}s: {str(error)}")
+        timer = threading.Timer(delay, self._queue.put, args=(job,))
+        timer.daemon = True
+        timer.start()
+    
+    def _dead_letter(self, job: Dict):
+        """Record an undeliverable message in memory (the newest dead_letter_limit) and, if configured, on disk"""
+        job['failed_at'] = datetime.now().isoformat()
+        self.dead_letters.append(job)
+        print(f"Failed to send email to {job['to_email']} after {job['attempts']} attempt(s): {job['last_error']}")
         
-        After verification, your account will be reviewed by our admin team.
+        if self.dead_letter_path:
+            try:
+                with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(job) + '\n')
+            except OSError as e:
+                print(f"Could not write email dead letter: {str(e)}")
+    
+    @staticmethod
+    def _new_job(to_email: str, subject: str, html_body: str, text_body: str = None) -> Dict:
+        return {
+            'to_email': to_email,
+            'subject': subject,
+            'html_body': html_body,
+            'text_body': text_body,
+            'attempts': 0,
+            'last_error': None,
+            'queued_at': datetime.now().isoformat()
+        }
+    
+    def _submit(self, job: Dict) -> bool:
+        """Queue a job in background mode, otherwise attempt it now"""
+        if not self.background:
+            return self._process(job)
         
-        If you didn't request this verification, please ignore this email.
+        self._start_workers()
+        self._queue.put(job)
+        return True
+    
+    def queue_email(self, to_email: str, subject: str, html_body: str, text_body: str = None) -> bool:
+        """Queue an email for delivery
         
-        © 2025 Navvi Corporation. All rights reserved.
+        Returns False if email is not configured or, without background
+        mode, if the message could not be sent.
         """
+        if not self.is_configured:
+            print("Email service not configured - skipping email send")
+            return False
         
-        return self.send_email(to_email, subject, html_body, text_body)
+        return self._submit(self._new_job(to_email, subject, html_body, text_body))
     
-    def send_approval_email(self, to_email: str, full_name: str, assessment_token: str, assessment_url: str) -> bool:
-        """Send account approval email"""
-        subject = "Your Datrix™ Account Has Been Approved!"
-        
-        html_body = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .button {{ background: #10b981; color: white; padding: 15px 40px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 20px 0; font-weight: bold; }}
-                .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🎉 Account Approved!</h1>
-                    <p>Datrix™ Business Intelligence Scanner</p>
-                </div>
-                <div class="content">
-                    <h2>Congratulations {full_name}!</h2>
-                    <p>Your Datrix™ account has been approved by our admin team.</p>
-                    <p>You can now access your personalized business intelligence assessment.</p>
-                    
-                    <div style="text-align: center;">
-                        <a href="{assessment_url}" class="button">Start Your Assessment</a>
-                    </div>
-                    
-                    <p><strong>What's Next?</strong></p>
-                    <ul>
-                        <li>Complete the 27-question business assessment</li>
-                        <li>Receive your detailed business intelligence report</li>
-                        <li>Get personalized recommendations for improvement</li>
-                    </ul>
-                    
-                    <p>Your assessment token: <strong>{assessment_token}</strong></p>
-                    
-                    <div class="footer">
-                        <p>© 2025 Navvi Corporation. All rights reserved.</p>
-                        <p>Need help? Contact us at support@navvicorp.com</p>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    def queue_batch(self, jobs: List[Dict]) -> List[bool]:
+        """Queue several emails to be sent back to back over one connection
         
-        text_body = f"""
-        Congratulations {full_name}!
-        
-        Your Datrix™ account has been approved by our admin team.
+        Returns one flag per message, in order: queued in background mode,
+        otherwise sent. All False if email is not configured.
+        """
+        if not self.is_configured:
+            print("Email service not configured - skipping email send")
+            return [False] * len(jobs)
+        if not jobs:
+            return []
         
-        You can now access your personalized business intelligence assessment.
+        if not self.background:
+            return self._process_batch(jobs)
         
-        Start your assessment here: {assessment_url}
+        self._submit({'batch': jobs})
+        return [True] * len(jobs)
+    
+    def retry_dead_letters(self) -> int:
+        """Re-queue (or, without background mode, resend) every dead-lettered message; returns how many"""
+        jobs, self.dead_letters = list(self.dead_letters), deque(maxlen=self.dead_letter_limit)
+        for job in jobs:
+            job['attempts'] = 0
+            self._submit(job)
+        return len(jobs)
+    
+    def flush(self):
+        """Block until every queued email has been attempted"""
+        self._queue.join()
+    
+    def send_verification_email(self, to_email: str, full_name: str, verification_code: str,
+                                background: bool = True, locale: str = None) -> bool:
+        """Send verification code email"""
+        subject, html_body, text_body = self.templates.render(
+            'verification', locale, full_name=full_name, verification_code=verification_code
+        )
         
-        Your assessment token: {assessment_token}
+        if background:
+            return self.queue_email(to_email, subject, html_body, text_body)
+        return self.send_email(to_email, subject, html_body, text_body)
+    
+    def build_approval_email(self, full_name: str, assessment_token: str, assessment_url: str,
+                             locale: str = None):
+        """Build (subject, html_body, text_body) for an account approval email"""
+        return self.templates.render(
+            'approval', locale,
+            full_name=full_name, assessment_token=assessment_token, assessment_url=assessment_url
+        )
+    
+    def send_approval_email(self, to_email: str, full_name: str, assessment_token: str, assessment_url: str,
+                            background: bool = True, locale: str = None) -> bool:
+        """Send account approval email"""
+        subject, html_body, text_body = self.build_approval_email(full_name, assessment_token, assessment_url, locale)
         
-        What's Next?
-        - Complete the 27-question business assessment
-        - Receive your detailed business intelligence report
-        - Get personalized recommendations for improvement
+        if background:
+            return self.queue_email(to_email, subject, html_body, text_body)
+        return self.send_email(to_email, subject, html_body, text_body)
+    
+    def send_approval_emails(self, approvals: List[Dict]) -> List[bool]:
+        """Queue approval emails as one batch delivered over a single SMTP session
         
-        © 2025 Navvi Corporation. All rights reserved.
-        Need help? Contact us at support@navvicorp.com
+        Each approval is a dict with email, full_name, assessment_token,
+        assessment_url and optionally locale. Returns one queued/sent flag
+        per approval, in order (see queue_batch).
         """
-        
-        return self.send_email(to_email, subject, html_body, text_body)
+        messages = []
+        for approval in approvals:
+            subject, html_body, text_body = self.build_approval_email(
+                approval['full_name'], approval['assessment_token'], approval['assessment_url'],
+                approval.get('locale')
+            )
+            messages.append(self._new_job(approval['email'], subject, html_body, text_body))
+        return self.queue_batch(messages)
 
 
 # Global email service instance
@@ -0,0 +1,282 @@
+"""
+Datrix™ Business Intelligence Scanner
+Precompiled email templates with per-locale variants
+"""
+
+import html
+import json
+import os
+import string
+import threading
+from typing import Dict, Optional, Tuple
+
+DEFAULT_LOCALE = 'en'
+
+class CompiledTemplate:
+    """A template body parsed once into literal text and placeholder chunks
+
+    Sources use str.format syntax, so `{name}` is a placeholder and `{{`
+    / `}}` are literal braces (the CSS blocks rely on this). The source is
+    parsed at startup; rendering only joins the literal chunks with the
+    values, with no re-parsing per recipient. Placeholders must be plain
+    names, without attribute access, indexing, format specs or conversions.
+    """
+
+    def __init__(self, source: str):
+        chunks = []
+        fields = []
+
+        for literal, field, format_spec, conversion in string.Formatter().parse(source):
+            if literal:
+                chunks.append((literal, None))
+            if field is None:
+                continue
+            if not field or '.' in field or '[' in field or format_spec or conversion:
+                raise ValueError(f"Unsupported placeholder in email template: {{{field}}}")
+            chunks.append((None, field))
+            if field not in fields:
+                fields.append(field)
+
+        self.fields = tuple(fields)
+        self._chunks = tuple(chunks)
+
+    def render(self, values: Dict[str, str]) -> str:
+        return ''.join([literal if field is None else values[field] for literal, field in self._chunks])
+
+
+class EmailTemplate:
+    """Compiled subject, HTML body and plain text body for one email
+
+    Values are HTML-escaped once per render for the HTML body; the subject
+    and plain text body get them unchanged.
+    """
+
+    def __init__(self, subject: str, html_body: str, text_body: str):
+        self.subject = CompiledTemplate(subject)
+        self.html_body = CompiledTemplate(html_body)
+        self.text_body = CompiledTemplate(text_body)
+        self.fields = tuple(dict.fromkeys(self.subject.fields + self.html_body.fields + self.text_body.fields))
+
+    def render(self, **values) -> Tuple[str, str, str]:
+        """Render (subject, html_body, text_body)"""
+        try:
+            values = {field: str(values[field]) for field in self.fields}
+        except KeyError as e:
+            raise KeyError(f"Missing email template value: {e.args[0]}") from None
+        escaped = {field: html.escape(values[field]) for field in self.html_body.fields}
+        return (
+            self.subject.render(values),
+            self.html_body.render(escaped),
+            self.text_body.render(values)
+        )
+
+
+class EmailTemplateRegistry:
+    """Compiled templates keyed by name and locale
+
+    Lookups fall back from a regional locale to its language ('ta-IN' to
+    'ta') and then to the default locale, so a locale only needs the
+    templates that have actually been translated.
+    """
+
+    def __init__(self, default_locale: str = DEFAULT_LOCALE):
+        self.default_locale = default_locale
+        self._templates = {}
+
+    def register(self, name: str, locale: str, subject: str, html_body: str, text_body: str) -> EmailTemplate:
+        template = EmailTemplate(subject, html_body, text_body)
+        self._templates[(name, locale.lower())] = template
+        return template
+
+    def get(self, name: str, locale: Optional[str] = None) -> EmailTemplate:
+        candidates = []
+        if locale:
+            locale = locale.replace('_', '-').lower()
+            candidates.append(locale)
+            if '-' in locale:
+                candidates.append(locale.split('-', 1)[0])
+        candidates.extend((self.default_locale, DEFAULT_LOCALE))
+
+        for candidate in candidates:
+            template = self._templates.get((name, candidate))
+            if template is not None:
+                return template
+        raise KeyError(f"No email template named '{name}'")
+
+    def render(self, name: str, locale: Optional[str] = None, **values) -> Tuple[str, str, str]:
+        """Render (subject, html_body, text_body) for a template"""
+        return self.get(name, locale).render(**values)
+
+    def load_directory(self, directory: str):
+        """Register every `<name>.<locale>.json` file in a directory
+
+        Each file holds "subject", "html" and "text" keys.
+        """
+        for filename in sorted(os.listdir(directory)):
+            parts = filename.split('.')
+            if len(parts) != 3 or parts[2] != 'json':
+                continue
+            with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                data = json.load(f)
+            self.register(parts[0], parts[1], data['subject'], data['html'], data['text'])
+
+
+VERIFICATION_SUBJECT = "Verify Your Datrix™ Account"
+
+VERIFICATION_HTML = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
+                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
+                .code-box {{ background: white; border: 2px dashed #667eea; padding: 20px; text-align: center; margin: 20px 0; border-radius: 8px; }}
+                .code {{ font-size: 32px; font-weight: bold; color: #667eea; letter-spacing: 5px; }}
+                .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
+                .button {{ background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 20px 0; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>Datrix™</h1>
+                    <p>Business Intelligence Scanner</p>
+                </div>
+                <div class="content">
+                    <h2>Hello {full_name},</h2>
+                    <p>Thank you for registering with Datrix™ Business Intelligence Scanner!</p>
+                    <p>Please use the verification code below to complete your registration:</p>
+                    
+                    <div class="code-box">
+                        <div class="code">{verification_code}</div>
+                    </div>
+                    
+                    <p><strong>Important:</strong></p>
+                    <ul>
+                        <li>This code is valid for 30 minutes</li>
+                        <li>Do not share this code with anyone</li>
+                        <li>After verification, your account will be reviewed by our admin team</li>
+                    </ul>
+                    
+                    <p>If you didn't request this verification, please ignore this email.</p>
+                    
+                    <div class="footer">
+                        <p>© 2025 Navvi Corporation. All rights reserved.</p>
+                        <p>This is an automated email. Please do not reply.</p>
+                    </div>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+VERIFICATION_TEXT = """
+        Hello {full_name},
+        
+        Thank you for registering with Datrix™ Business Intelligence Scanner!
+        
+        Your verification code is: {verification_code}
+        
+        This code is valid for 30 minutes. Please do not share it with anyone.
+        
+        After verification, your account will be reviewed by our admin team.
+        
+        If you didn't request this verification, please ignore this email.
+        
+        © 2025 Navvi Corporation. All rights reserved.
+        """
+
+APPROVAL_SUBJECT = "Your Datrix™ Account Has Been Approved!"
+
+APPROVAL_HTML = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
+                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
+                .button {{ background: #10b981; color: white; padding: 15px 40px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 20px 0; font-weight: bold; }}
+                .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>🎉 Account Approved!</h1>
+                    <p>Datrix™ Business Intelligence Scanner</p>
+                </div>
+                <div class="content">
+                    <h2>Congratulations {full_name}!</h2>
+                    <p>Your Datrix™ account has been approved by our admin team.</p>
+                    <p>You can now access your personalized business intelligence assessment.</p>
+                    
+                    <div style="text-align: center;">
+                        <a href="{assessment_url}" class="button">Start Your Assessment</a>
+                    </div>
+                    
+                    <p><strong>What's Next?</strong></p>
+                    <ul>
+                        <li>Complete the 27-question business assessment</li>
+                        <li>Receive your detailed business intelligence report</li>
+                        <li>Get personalized recommendations for improvement</li>
+                    </ul>
+                    
+                    <p>Your assessment token: <strong>{assessment_token}</strong></p>
+                    
+                    <div class="footer">
+                        <p>© 2025 Navvi Corporation. All rights reserved.</p>
+                        <p>Need help? Contact us at support@navvicorp.com</p>
+                    </div>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+APPROVAL_TEXT = """
+        Congratulations {full_name}!
+        
+        Your Datrix™ account has been approved by our admin team.
+        
+        You can now access your personalized business intelligence assessment.
+        
+        Start your assessment here: {assessment_url}
+        
+        Your assessment token: {assessment_token}
+        
+        What's Next?
+        - Complete the 27-question business assessment
+        - Receive your detailed business intelligence report
+        - Get personalized recommendations for improvement
+        
+        © 2025 Navvi Corporation. All rights reserved.
+        Need help? Contact us at support@navvicorp.com
+        """
+
+def build_default_registry() -> EmailTemplateRegistry:
+    """Compile the built-in templates plus any from EMAIL_TEMPLATE_DIR"""
+    registry = EmailTemplateRegistry(os.getenv('EMAIL_DEFAULT_LOCALE', DEFAULT_LOCALE).lower())
+    registry.register('verification', DEFAULT_LOCALE, VERIFICATION_SUBJECT, VERIFICATION_HTML, VERIFICATION_TEXT)
+    registry.register('approval', DEFAULT_LOCALE, APPROVAL_SUBJECT, APPROVAL_HTML, APPROVAL_TEXT)
+
+    template_dir = os.getenv('EMAIL_TEMPLATE_DIR')
+    if template_dir:
+        registry.load_directory(template_dir)
+    return registry
+
+
+# Global template registry instance
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_email_templates() -> EmailTemplateRegistry:
+    """Get or create the compiled email template registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = build_default_registry()
+    return _registry
@@ -0,0 +1,149 @@
+"""
+Datrix™ Business Intelligence Scanner
+Keyset pagination over PostgREST tables for the admin listings
+"""
+
+import base64
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.config.supabase_client import COUNT_MODES, SupabaseClient, quote_value
+
+# Page sizes for the admin listings (main.py and routes/admin.py)
+ADMIN_PAGE_SIZE = int(os.getenv('ADMIN_PAGE_SIZE', '100'))
+ADMIN_MAX_PAGE_SIZE = int(os.getenv('ADMIN_MAX_PAGE_SIZE', '1000'))
+ADMIN_EXPORT_PAGE_SIZE = int(os.getenv('ADMIN_EXPORT_PAGE_SIZE', '1000'))
+
+# Keyset and from/to filter column of every admin listing
+ADMIN_SORT_COLUMN = 'created_at'
+
+# User columns the admin listing may project; verification_code is never exposed
+USER_COLUMNS = (
+    'id', 'full_name', 'designation', 'email', 'mobile', 'business_name', 'business_type',
+    'is_verified', 'is_approved', 'assessment_token', 'status', 'created_at', 'updated_at', 'last_login'
+)
+USER_DEFAULT_COLUMNS = USER_COLUMNS
+
+# Assessment listing returns summary columns; heavy JSONB fields are opt-in via ?expand=
+ASSESSMENT_SUMMARY_COLUMNS = (
+    'id', 'user_id', 'total_score', 'max_score', 'percentage', 'overall_grade',
+    'performance_tier', 'completed_at', 'created_at'
+)
+ASSESSMENT_EXPANSIONS = {
+    'answers': 'answers',
+    'category_scores': 'category_scores',
+    'insights': 'insights',
+    'recommendations': 'recommendations',
+    'user': 'users(full_name,email,business_name)'
+}
+
+def encode_cursor(sort_value, row_id) -> str:
+    """Opaque cursor for the row a page ended on"""
+    raw = json.dumps([sort_value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[Optional[str], str]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor
+
+    A NULL sort value round-trips as None.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+    return (None if sort_value is None else str(sort_value)), str(row_id)
+
+def parse_limit(requested: Optional[str], default: int, maximum: int) -> int:
+    """Validate a page size, clamped to `maximum`; raises ValueError if it is not a positive integer"""
+    if requested is None or requested == '':
+        return default
+    try:
+        limit = int(requested)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, maximum)
+
+def parse_columns(requested: Optional[str], allowed: Sequence[str], default: Sequence[str],
+                  required: Sequence[str] = ('id',)) -> List[str]:
+    """Validate a comma separated column list against `allowed`
+
+    Required columns (the pagination key) are always included. Raises
+    ValueError naming any unknown column.
+    """
+    if not requested:
+        columns = list(default)
+    else:
+        columns = [column.strip() for column in requested.split(',') if column.strip()]
+        unknown = [column for column in columns if column not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+
+    for column in reversed(required):
+        if column not in columns:
+            columns.insert(0, column)
+    return list(dict.fromkeys(columns))
+
+def fetch_keyset_page(client: SupabaseClient, table: str, columns: Sequence[str],
+                      filters: List[Tuple[str, str]] = None, sort_column: str = ADMIN_SORT_COLUMN,
+                      descending: bool = True, cursor: str = None, limit: int = 100,
+                      count: Optional[str] = 'exact') -> Dict:
+    """Fetch one page ordered by (sort_column, id)
+
+    The cursor is the (sort value, id) of the last row of the previous page,
+    so each page is an index range scan instead of an ever growing OFFSET.
+    One extra row is requested to tell whether another page follows. When
+    count is one of COUNT_MODES the total matching rows are read from the
+    Content-Range header PostgREST returns for that Prefer.
+
+    filters are (column, 'operator.value') pairs in PostgREST form.
+    Returns {'rows', 'next_cursor', 'total'}.
+    """
+    comparison = 'lt' if descending else 'gt'
+
+    query = client.query(table, use_service_key=True).select(','.join(columns))
+    for column, condition in filters or []:
+        query.where(column, condition)
+    query.order(sort_column, desc=descending).order('id', desc=descending).limit(limit + 1)
+    if count in COUNT_MODES:
+        query.count(count)
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query.or_(
+            f'{sort_column}.{comparison}.{quote_value(sort_value)}',
+            f'and({sort_column}.eq.{quote_value(sort_value)},id.{comparison}.{quote_value(row_id)})'
+        )
+
+    result = query.execute()
+    if result.error:
+        raise RuntimeError(f'Failed to fetch {table}: {result.status} {result.error}')
+
+    rows = result.data
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[sort_column], last['id'])
+
+    return {
+        'rows': rows,
+        'next_cursor': next_cursor,
+        'total': result.count
+    }
+
+def iter_keyset_pages(client: SupabaseClient, table: str, columns: Sequence[str],
+                      filters: List[Tuple[str, str]] = None, sort_column: str = ADMIN_SORT_COLUMN,
+                      descending: bool = True, page_size: int = 500) -> Iterator[List[Dict]]:
+    """Yield every matching row page by page without counting"""
+    cursor = None
+    while True:
+        page = fetch_keyset_page(client, table, columns, filters, sort_column,
+                                 descending, cursor, page_size, count=None)
+        if page['rows']:
+            yield page['rows']
+        cursor = page['next_cursor']
+        if cursor is None:
+            return
@@ -0,0 +1,226 @@
+"""
+Datrix™ Business Intelligence Scanner
+Background PDF rendering queue backed by a process pool
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from src.services.pdf_service import render_pdf_bytes
+from src.services.pdf_store import PDFArtifactStore, get_pdf_store
+
+# Job states reported by the status API
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+# Job ids are artifact keys (report_cache_key digests)
+JOB_ID_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+class PDFRenderQueue:
+    """Render PDF reports off the request thread and track them as jobs
+
+    Rendering runs in a process pool because reportlab is CPU-bound and
+    would otherwise hold the GIL inside Flask workers. Finished PDFs go into
+    the artifact store under their content key. A job's id is that artifact
+    key and its state is kept in the store, so any worker sharing the store
+    directory can report on a job another worker started. Enqueueing a key
+    that is already stored or already rendering returns the existing job,
+    so a burst of requests for one report renders it once. With
+    max_workers=0, jobs render synchronously in the caller. A pool broken by
+    a crashed worker is replaced, so one crash fails only the renders it
+    was running.
+    """
+
+    def __init__(self, store: PDFArtifactStore, max_workers: int = 2, job_ttl: float = 3600):
+        self.store = store
+        self.max_workers = max_workers
+        self.job_ttl = job_ttl
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Drop a broken pool so the next render starts a fresh one"""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _on_render_done(self, executor: ProcessPoolExecutor, future: Future):
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._discard_executor(executor)
+
+    def _submit(self, report_data: Dict) -> Future:
+        """Start a render on the process pool, replacing the pool if it is broken"""
+        executor = self._get_executor()
+        try:
+            future = executor.submit(render_pdf_bytes, report_data)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            future = executor.submit(render_pdf_bytes, report_data)
+        future.add_done_callback(lambda f: self._on_render_done(executor, f))
+        return future
+
+    def _is_live(self, job: Dict) -> bool:
+        """Whether a stored job record is recent enough to report
+
+        A pending record older than job_ttl belongs to a worker that died
+        mid-render and is treated as unknown, so the report can be queued
+        again.
+        """
+        started = job['created_at'] if job['status'] == PENDING else job['finished_at']
+        return time.time() - started < self.job_ttl
+
+    def _finish(self, job: Dict, pdf_bytes: bytes = None, error: str = None):
+        artifact_key = job['artifact_key']
+        if error is None:
+            try:
+                self.store.put(artifact_key, lambda: pdf_bytes,
+                               {'download_name': job['download_name']})
+            except Exception as e:
+                error = str(e)
+
+        if error:
+            self.store.put_job(artifact_key, dict(job, status=FAILED, error=error, finished_at=time.time()))
+            print(f"PDF render job {job['job_id']} failed: {error}")
+        else:
+            self.store.remove_job(artifact_key)
+
+    def _on_done(self, job: Dict, future: Future):
+        try:
+            self._finish(job, pdf_bytes=future.result())
+        except Exception as e:
+            self._finish(job, error=str(e))
+
+    def enqueue(self, artifact_key: str, report_data: Dict, download_name: str) -> Dict:
+        """Queue a report for rendering and return its job record"""
+        with self._lock:
+            job = self.status(artifact_key)
+            if job is not None and job['status'] != FAILED:
+                return job
+
+            job = {
+                'job_id': artifact_key,
+                'artifact_key': artifact_key,
+                'download_name': download_name,
+                'status': PENDING,
+                'error': None,
+                'created_at': time.time(),
+                'finished_at': None
+            }
+            self.store.put_job(artifact_key, job)
+
+        if self.max_workers <= 0:
+            try:
+                self._finish(job, pdf_bytes=render_pdf_bytes(report_data))
+            except Exception as e:
+                self._finish(job, error=str(e))
+        else:
+            self._submit(report_data).add_done_callback(lambda f: self._on_done(job, f))
+
+        return self.status(artifact_key) or job
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Get a job record by id (its artifact key), or None if unknown"""
+        if not JOB_ID_PATTERN.fullmatch(job_id or ''):
+            return None
+
+        artifact = self.store.get(job_id)
+        if artifact is not None:
+            return {
+                'job_id': job_id,
+                'artifact_key': job_id,
+                'download_name': artifact[1].get('download_name'),
+                'status': DONE,
+                'error': None,
+                'created_at': None,
+                'finished_at': None
+            }
+
+        job = self.store.get_job(job_id)
+        if job is None or not self._is_live(job):
+            return None
+        return job
+
+    def _stored_pdf(self, artifact_key: Optional[str]) -> Optional[bytes]:
+        """Bytes of an already rendered PDF, or None"""
+        stored = self.store.get(artifact_key) if artifact_key else None
+        if stored is None:
+            return None
+        try:
+            with open(stored[0], 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def render_many(self, items: Iterable[Tuple[str, Dict, Optional[str]]],
+                    window: int = None) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+        """Render (name, report_data, artifact_key) items, yielding (name, pdf_bytes, error) in order
+
+        PDFs already in the artifact store are read from it instead of being
+        rendered again. A failed render yields (name, None, error) and the
+        rest carry on. At most `window` renders are in flight at once, so
+        memory stays bounded however many items there are.
+        """
+        def outcome(name: str, future: Future):
+            try:
+                return name, future.result(), None
+            except Exception as e:
+                return name, None, str(e) or type(e).__name__
+
+        window = window or max(self.max_workers, 1) * 2
+        in_flight = deque()
+
+        for name, report_data, artifact_key in items:
+            future = Future()
+            pdf_bytes = self._stored_pdf(artifact_key)
+            if pdf_bytes is not None:
+                future.set_result(pdf_bytes)
+            elif self.max_workers <= 0:
+                try:
+                    future.set_result(render_pdf_bytes(report_data))
+                except Exception as e:
+                    future.set_exception(e)
+            else:
+                future = self._submit(report_data)
+
+            in_flight.append((name, future))
+            if len(in_flight) >= window:
+                yield outcome(*in_flight.popleft())
+
+        while in_flight:
+            yield outcome(*in_flight.popleft())
+
+    def shutdown(self, wait: bool = True):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Global render queue instance
+_render_queue = None
+
+def get_render_queue() -> PDFRenderQueue:
+    """Get or create PDF render queue instance"""
+    global _render_queue
+    if _render_queue is None:
+        _render_queue = PDFRenderQueue(
+            get_pdf_store(),
+            max_workers=int(os.getenv('PDF_RENDER_WORKERS', '2')),
+            job_ttl=float(os.getenv('PDF_JOB_TTL_SECONDS', '3600'))
+        )
+    return _render_queue
@@ -11,77 +11,154 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfgen import canvas
 from datetime import datetime
+import copy
 import io
 
+def _build_report_styles():
+    """Build the sample style sheet plus the custom paragraph styles"""
+    styles = getSampleStyleSheet()
+    
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1a365d'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Subtitle style
+    styles.add(ParagraphStyle(
+        name='CustomSubtitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#2d3748'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Section header
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading3'],
+        fontSize=14,
+        textColor=colors.HexColor('#4a5568'),
+        spaceAfter=10,
+        spaceBefore=15,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Body text
+    styles.add(ParagraphStyle(
+        name='CustomBody',
+        parent=styles['BodyText'],
+        fontSize=10,
+        textColor=colors.HexColor('#2d3748'),
+        spaceAfter=8,
+        alignment=TA_JUSTIFY,
+        leading=14
+    ))
+    
+    # Tier badge style
+    styles.add(ParagraphStyle(
+        name='TierBadge',
+        parent=styles['Normal'],
+        fontSize=18,
+        textColor=colors.white,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    
+    return styles
+
+# Shared by every generator in the process; treat as read-only
+REPORT_STYLES = _build_report_styles()
+
+# Table styles reused by every report
+COVER_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f7fafc')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2d3748')),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e0'))
+])
+
+SCORE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')])
+])
+
+RECOMMENDATION_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('ALIGN', (3, 0), (3, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')]),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+])
+
+# Static paragraphs, parsed once; copy before adding to a story
+DISCLAIMER = Paragraph("""
+<para align=center fontSize=9 textColor=#718096>
+This report is confidential and intended solely for the use of the organization named above.
+The assessment is based on self-reported information and industry benchmarks.
+</para>
+""", REPORT_STYLES['CustomBody'])
+
+CALL_TO_ACTION = Paragraph("""
+<para align=center fontSize=12>
+<b>Ready to transform your business?</b><br/>
+Schedule a consultation with our experts to discuss your customized improvement roadmap.<br/><br/>
+<b>Navvi Corporations</b><br/>
+Email: support@navvicorp.com | Web: www.navvicorp.com
+</para>
+""", REPORT_STYLES['CustomBody'])
+
+# Header/footer drawing constants
+HEADER_COLOR = colors.HexColor('#4a5568')
+FOOTER_COLOR = colors.HexColor('#718096')
+HEADER_TEXT = "Datrix™ Business Intelligence Report"
+FOOTER_TEXT = "Confidential - Navvi Corporations"
+
 class PDFReportGenerator:
     """Generate professional PDF reports"""
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a365d'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Subtitle style
-        self.styles.add(ParagraphStyle(
-            name='CustomSubtitle',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#2d3748'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Section header
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading3'],
-            fontSize=14,
-            textColor=colors.HexColor('#4a5568'),
-            spaceAfter=10,
-            spaceBefore=15,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Body text
-        self.styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=self.styles['BodyText'],
-            fontSize=10,
-            textColor=colors.HexColor('#2d3748'),
-            spaceAfter=8,
-            alignment=TA_JUSTIFY,
-            leading=14
-        ))
-        
-        # Tier badge style
-        self.styles.add(ParagraphStyle(
-            name='TierBadge',
-            parent=self.styles['Normal'],
-            fontSize=18,
-            textColor=colors.white,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
+        self.styles = REPORT_STYLES
     
-    def generate_pdf(self, report_data: dict, output_path: str):
-        """Generate complete PDF report"""
+    def generate_pdf(self, report_data: dict, output_path=None):
+        """Generate complete PDF report
+        
+        output_path may be a filename or a writable binary stream. When it is
+        omitted the report is rendered into memory and the PDF bytes are
+        returned, with no temp file involved.
+        """
+        
+        target = io.BytesIO() if output_path is None else output_path
         
         doc = SimpleDocTemplate(
-            output_path,
+            target,
             pagesize=letter,
             rightMargin=72,
             leftMargin=72,
@@ -89,6 +166,9 @@ class PDFReportGenerator:
             bottomMargin=18
         )
         
+        # Footer date, formatted once per document rather than once per page
+        doc.generated_on = f"Generated on {datetime.now().strftime('%B %d, %Y')}"
+        
         # Container for the 'Flowable' objects
         elements = []
         
@@ -114,6 +194,8 @@ class PDFReportGenerator:
         doc.build(elements, onFirstPage=self._add_header_footer, 
                  onLaterPages=self._add_header_footer)
         
+        if output_path is None:
+            return target.getvalue()
         return output_path
     
     def _create_cover_page(self, report_data: dict):
@@ -147,28 +229,13 @@ class PDFReportGenerator:
         ]
         
         score_table = Table(score_data, colWidths=[3*inch, 2*inch])
-        score_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f7fafc')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2d3748')),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e0'))
-        ]))
+        score_table.setStyle(COVER_TABLE_STYLE)
         
         elements.append(score_table)
         elements.append(Spacer(1, 0.5*inch))
         
         # Disclaimer
-        disclaimer = """
-        <para align=center fontSize=9 textColor=#718096>
-        This report is confidential and intended solely for the use of the organization named above.
-        The assessment is based on self-reported information and industry benchmarks.
-        </para>
-        """
-        elements.append(Paragraph(disclaimer, self.styles['CustomBody']))
+        elements.append(copy.copy(DISCLAIMER))
         
         return elements
     
@@ -208,19 +275,7 @@ class PDFReportGenerator:
             table_data.append([category_name, score, tier, benchmark])
         
         score_table = Table(table_data, colWidths=[2.5*inch, 1*inch, 1.5*inch, 1.5*inch])
-        score_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')])
-        ]))
+        score_table.setStyle(SCORE_TABLE_STYLE)
         
         elements.append(score_table)
         
@@ -288,20 +343,7 @@ class PDFReportGenerator:
             ])
         
         rec_table = Table(table_data, colWidths=[0.8*inch, 1.2*inch, 3.5*inch, 0.8*inch])
-        rec_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (3, 0), (3, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
-        ]))
+        rec_table.setStyle(RECOMMENDATION_TABLE_STYLE)
         
         elements.append(rec_table)
         
@@ -325,15 +367,7 @@ class PDFReportGenerator:
         elements.append(Spacer(1, 0.3*inch))
         
         # Call to action
-        cta = """
-        <para align=center fontSize=12>
-        <b>Ready to transform your business?</b><br/>
-        Schedule a consultation with our experts to discuss your customized improvement roadmap.<br/><br/>
-        <b>Navvi Corporations</b><br/>
-        Email: support@navvicorp.com | Web: www.navvicorp.com
-        </para>
-        """
-        elements.append(Paragraph(cta, self.styles['CustomBody']))
+        elements.append(copy.copy(CALL_TO_ACTION))
         
         return elements
     
@@ -343,16 +377,27 @@ class PDFReportGenerator:
         
         # Header
         canvas.setFont('Helvetica-Bold', 10)
-        canvas.setFillColor(colors.HexColor('#4a5568'))
-        canvas.drawString(72, letter[1] - 50, "Datrix™ Business Intelligence Report")
+        canvas.setFillColor(HEADER_COLOR)
+        canvas.drawString(72, letter[1] - 50, HEADER_TEXT)
         canvas.line(72, letter[1] - 55, letter[0] - 72, letter[1] - 55)
         
         # Footer
         canvas.setFont('Helvetica', 8)
-        canvas.setFillColor(colors.HexColor('#718096'))
-        canvas.drawString(72, 30, f"Generated on {datetime.now().strftime('%B %d, %Y')}")
+        canvas.setFillColor(FOOTER_COLOR)
+        canvas.drawString(72, 30, doc.generated_on)
         canvas.drawRightString(letter[0] - 72, 30, f"Page {doc.page}")
-        canvas.drawCentredString(letter[0]/2, 30, "Confidential - Navvi Corporations")
+        canvas.drawCentredString(letter[0]/2, 30, FOOTER_TEXT)
         
         canvas.restoreState()
 
+
+
+# Per-process generator used by render_pdf_bytes (one per pool worker)
+_process_generator = None
+
+def render_pdf_bytes(report_data: dict) -> bytes:
+    """Render report data to PDF bytes; safe to run in a worker process"""
+    global _process_generator
+    if _process_generator is None:
+        _process_generator = PDFReportGenerator()
+    return _process_generator.generate_pdf(report_data)
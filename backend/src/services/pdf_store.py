@@ -0,0 +1,146 @@
+"""
+Datrix™ Business Intelligence Scanner
+Content-addressed store for rendered PDF reports
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+class PDFArtifactStore:
+    """Size-bounded directory of rendered PDFs keyed by content hash
+
+    Each artifact is `<key>.pdf` with a `<key>.json` sidecar for metadata
+    such as the download filename. Files are written to a temp name and
+    renamed into place, so concurrent requests never see a partial PDF.
+    When the store grows past max_bytes the least recently used PDFs are
+    removed.
+
+    Render jobs keep their state in a `<key>.job.json` file beside the
+    artifact, so every worker sharing the directory sees the same jobs.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _pdf_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _job_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.job.json")
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """Get (path, metadata) for a stored artifact, or None"""
+        path = self._pdf_path(key)
+        try:
+            os.utime(path)  # mark as recently used for eviction
+            with open(self._meta_path(key), encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return path, metadata
+
+    def put(self, key: str, render: Callable[[], bytes], metadata: Dict = None) -> Tuple[str, Dict]:
+        """Store the bytes from render() unless another request already has"""
+        with self._key_lock(key):
+            existing = self.get(key)
+            if existing:
+                return existing
+
+            pdf_bytes = render()
+            metadata = dict(metadata or {}, size=len(pdf_bytes))
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(pdf_bytes)
+                with open(self._meta_path(key), 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f)
+                os.replace(tmp_path, self._pdf_path(key))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+
+        self._evict(keep=key)
+        return self._pdf_path(key), metadata
+
+    def get_job(self, key: str) -> Optional[Dict]:
+        """Get the stored render job record for a key, or None"""
+        try:
+            with open(self._job_path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put_job(self, key: str, job: Dict):
+        """Write a render job record, replacing any previous one"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(job, f)
+            os.replace(tmp_path, self._job_path(key))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def remove_job(self, key: str):
+        """Forget a render job record"""
+        try:
+            os.remove(self._job_path(key))
+        except OSError:
+            pass
+
+    def _evict(self, keep: str = None):
+        """Remove least recently used artifacts until under max_bytes"""
+        artifacts = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pdf'):
+                stat = entry.stat()
+                artifacts.append((stat.st_mtime, stat.st_size, entry.name[:-4]))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, key in sorted(artifacts):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            for path in (self._pdf_path(key), self._meta_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+
+# Global PDF store instance
+_pdf_store = None
+
+def get_pdf_store() -> PDFArtifactStore:
+    """Get or create PDF artifact store instance"""
+    global _pdf_store
+    if _pdf_store is None:
+        _pdf_store = PDFArtifactStore(
+            os.getenv('PDF_STORE_DIR') or os.path.join(tempfile.gettempdir(), 'datrix_reports'),
+            max_bytes=int(os.getenv('PDF_STORE_MAX_MB', '500')) * 1024 * 1024
+        )
+    return _pdf_store
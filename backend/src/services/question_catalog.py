@@ -0,0 +1,166 @@
+"""
+Datrix™ Business Intelligence Scanner
+In-process cache of the assessment question catalogue
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+from src.config.supabase_client import SupabaseClient
+
+class CatalogSnapshot:
+    """Immutable view of the active categories and questions
+
+    The version is a checksum of the catalogue content, so every worker
+    reports the same version for the same questions.
+    """
+
+    def __init__(self, checksum: str, categories: List[Dict], questions: List[Dict]):
+        self.checksum = checksum
+        self.version = checksum
+        self.loaded_at = time.time()
+        self.categories = categories
+        self.questions = questions
+
+        # Single pass indexes shared by the questions and submit handlers
+        self.questions_by_id = {}
+        self.questions_by_category = {category['id']: [] for category in categories}
+        for question in questions:
+            self.questions_by_id[question['id']] = question
+            category_questions = self.questions_by_category.get(question['category_id'])
+            if category_questions is not None:
+                category_questions.append(question)
+
+        self.category_max_scores = {
+            category_id: sum(q['max_score'] for q in category_questions)
+            for category_id, category_questions in self.questions_by_category.items()
+        }
+
+        # Categories with their questions, ready to serve from /api/assessment/questions
+        self.grouped = []
+        for category in categories:
+            self.grouped.append({
+                'id': category['id'],
+                'name': category['name'],
+                'description': category['description'],
+                'weight': category['weight'],
+                'questions': self.questions_by_category[category['id']]
+            })
+
+
+class QuestionCatalog:
+    """TTL cache of the question catalogue with explicit invalidation
+
+    The catalogue is read from Supabase on first use and then at most once
+    per TTL. Expired snapshots keep being served while a single thread
+    reloads them, so a slow or failing refresh never blocks the questions
+    endpoint once the cache is warm.
+
+    The cache lives in one process. invalidate() only reaches the worker
+    that handles it; other workers pick up a changed catalogue on their
+    next background refresh (every refresh_interval seconds, compared by
+    checksum) or when their TTL runs out.
+    """
+
+    def __init__(self, client: SupabaseClient, ttl: float = 3600, refresh_interval: float = 0):
+        self.client = client
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._expired = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+
+    def _fetch(self, table: str) -> List[Dict]:
+        """Fetch active rows of a catalogue table in display order"""
+        result = (self.client.query(table, use_service_key=True)
+                  .eq('is_active', True)
+                  .order('display_order')
+                  .execute())
+        if result.error:
+            raise RuntimeError(f'Failed to fetch {table}: {result.status}')
+        return result.data
+
+    def _is_fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        return (snapshot is not None and not self._expired
+                and time.time() - snapshot.loaded_at < self.ttl)
+
+    def refresh(self) -> CatalogSnapshot:
+        """Reload the catalogue from Supabase"""
+        with self._lock:
+            return self._reload()
+
+    def _refresh_stale(self, seen: Optional[CatalogSnapshot]) -> CatalogSnapshot:
+        """Reload the catalogue unless another thread already replaced `seen`
+
+        Concurrent readers of a cold or expired cache queue on the lock; only
+        the first one fetches, the rest pick up the snapshot it stored.
+        """
+        with self._lock:
+            current = self._snapshot
+            if current is not seen and self._is_fresh(current):
+                return current
+            return self._reload()
+
+    def _reload(self) -> CatalogSnapshot:
+        """Fetch both tables and store a new snapshot; caller holds the lock"""
+        categories = self._fetch('assessment_categories')
+        questions = self._fetch('assessment_questions')
+
+        checksum = hashlib.sha1(
+            json.dumps([categories, questions], sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+
+        self._snapshot = CatalogSnapshot(checksum, categories, questions)
+        self._expired = False
+        return self._snapshot
+
+    def get(self) -> CatalogSnapshot:
+        """Get the current snapshot, reloading it when expired"""
+        if self._refresher is None and self.refresh_interval > 0:
+            self.start_background_refresh(self.refresh_interval)
+
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        if snapshot is None:
+            return self._refresh_stale(snapshot)
+
+        # Serve the stale snapshot if another thread is already reloading
+        if self._lock.locked():
+            return snapshot
+
+        try:
+            return self._refresh_stale(snapshot)
+        except Exception as e:
+            print(f"Question catalogue refresh failed, serving version {snapshot.version}: {str(e)}")
+            return snapshot
+
+    def invalidate(self):
+        """Force this process's next read to reload the catalogue"""
+        self._expired = True
+
+    def start_background_refresh(self, interval: float):
+        """Reload the catalogue every `interval` seconds on a daemon thread"""
+        with self._refresher_lock:
+            if self._refresher is not None or interval <= 0:
+                return
+
+            def run():
+                while not self._stop.wait(interval):
+                    try:
+                        self.refresh()
+                    except Exception as e:
+                        print(f"Background question catalogue refresh failed: {str(e)}")
+
+            self._refresher = threading.Thread(target=run, name='question-catalog-refresh', daemon=True)
+            self._refresher.start()
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        self._stop.set()
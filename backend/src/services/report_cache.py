@@ -0,0 +1,141 @@
+"""
+Datrix™ Business Intelligence Scanner
+Content-addressed cache for generated report data
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+from src.services.report_generator import REPORT_VERSION
+
+def report_cache_key(assessment_id: str, answers: Dict, version: str = REPORT_VERSION) -> str:
+    """Key a report by assessment, answer content and report framework version"""
+    answers_hash = hashlib.sha256(
+        json.dumps(answers or {}, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    return hashlib.sha256(f"{assessment_id}:{answers_hash}:{version}".encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """LRU cache of report data with an optional on-disk tier
+
+    Keys are content addresses, so an entry never needs invalidating: new
+    answers or a new report version simply produce a different key and the
+    old entry ages out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None,
+                 max_disk_entries: int = 5000):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, report_data: Dict):
+        if not self.disk_dir:
+            return
+        try:
+            # Write to a temp file and rename so readers never see partial JSON
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(report_data, f)
+            os.replace(tmp_path, self._disk_path(key))
+            self._prune_disk()
+        except OSError as e:
+            print(f"Report cache disk write failed: {str(e)}")
+
+    def _prune_disk(self):
+        """Drop the least recently written files beyond max_disk_entries"""
+        entries = [e for e in os.scandir(self.disk_dir) if e.name.endswith('.json')]
+        if len(entries) <= self.max_disk_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _remember(self, key: str, report_data: Dict):
+        with self._lock:
+            self._entries[key] = report_data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up a report in memory, then on disk"""
+        with self._lock:
+            report_data = self._entries.get(key)
+            if report_data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return report_data
+
+        report_data = self._read_disk(key)
+        if report_data is not None:
+            self._remember(key, report_data)
+            self.hits += 1
+            return report_data
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, report_data: Dict):
+        """Store a report in memory and on disk"""
+        self._remember(key, report_data)
+        self._write_disk(key, report_data)
+
+    def get_or_generate(self, key: str, generate: Callable[[], Dict]) -> Dict:
+        """Return the cached report for key, generating and storing it on a miss"""
+        report_data = self.get(key)
+        if report_data is None:
+            report_data = generate()
+            self.put(key, report_data)
+        return report_data
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'disk_dir': self.disk_dir,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+# Global report cache instance
+_report_cache = None
+
+def get_report_cache() -> ReportCache:
+    """Get or create report cache instance"""
+    global _report_cache
+    if _report_cache is None:
+        _report_cache = ReportCache(
+            max_entries=int(os.getenv('REPORT_CACHE_SIZE', '256')),
+            disk_dir=os.getenv('REPORT_CACHE_DIR') or None,
+            max_disk_entries=int(os.getenv('REPORT_CACHE_DISK_ENTRIES', '5000'))
+        )
+    return _report_cache
@@ -0,0 +1,79 @@
+"""
+Datrix™ Business Intelligence Scanner
+Bulk export of assessment PDF reports as a streamed ZIP
+"""
+
+import io
+import zipfile
+from typing import Dict, Iterable, Iterator, List, Tuple
+from src.services.pdf_jobs import PDFRenderQueue
+
+class ZipStream(io.RawIOBase):
+    """Write-only sink that hands ZipFile output back in chunks
+
+    ZipFile detects that the sink cannot seek and writes data descriptors
+    instead, so each archive member can be yielded as soon as it is written.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(files: Iterable[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """Yield a ZIP archive of (name, data) files incrementally"""
+    sink = ZipStream()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files:
+            archive.writestr(name, data)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_report_zip(pages: Iterable[List[Dict]], build_report, render_queue: PDFRenderQueue,
+                      window: int = None) -> Iterator[bytes]:
+    """Render every assessment in `pages` and stream the PDFs as one ZIP
+
+    build_report(assessment) returns (filename, report_data, artifact_key),
+    or None to skip the assessment; PDFs already stored under artifact_key
+    are reused. Pages are consumed lazily and at most `window` renders are
+    in flight, so memory stays bounded by page size and window rather than
+    by the number of reports. A report that fails to build or render is
+    left out and listed in a final errors.txt entry, so the archive stays
+    valid.
+    """
+    errors = []
+
+    def items():
+        for page in pages:
+            for assessment in page:
+                try:
+                    item = build_report(assessment)
+                except Exception as e:
+                    errors.append(f"{assessment.get('id')}: {str(e)}")
+                    continue
+                if item is not None:
+                    yield item
+
+    def files():
+        for name, pdf_bytes, error in render_queue.render_many(items(), window=window):
+            if error is not None:
+                errors.append(f"{name}: {error}")
+            else:
+                yield name, pdf_bytes
+
+        if errors:
+            yield 'errors.txt', ''.join(f"{line}\n" for line in errors).encode('utf-8')
+
+    return stream_zip(files())
@@ -4,8 +4,430 @@ Generates comprehensive PDF reports with insights and benchmarks
 """
 
 from datetime import datetime
-from typing import Dict, List
+from types import MappingProxyType
+import hashlib
+from typing import Dict, List, Mapping
 import json
+import os
+
+# McKinsey-style insights per category and performance tier
+INSIGHTS_LIBRARY = {
+    'operational': {
+        'World Class': {
+            'strengths': [
+                'Exceptional operational efficiency with lean manufacturing principles',
+                'Advanced production planning and scheduling systems',
+                'Industry-leading capacity utilization rates'
+            ],
+            'opportunities': [
+                'Share best practices with industry peers',
+                'Explore Industry 4.0 automation opportunities',
+                'Consider vertical integration strategies'
+            ]
+        },
+        'Industry Leader': {
+            'strengths': [
+                'Strong operational processes and workflows',
+                'Good production efficiency metrics',
+                'Effective resource management'
+            ],
+            'opportunities': [
+                'Implement advanced analytics for predictive maintenance',
+                'Optimize production line balancing',
+                'Enhance real-time monitoring capabilities'
+            ]
+        },
+        'Competitive': {
+            'strengths': [
+                'Established operational procedures',
+                'Adequate production capabilities',
+                'Basic efficiency tracking in place'
+            ],
+            'opportunities': [
+                'Implement lean manufacturing methodologies',
+                'Invest in production planning software',
+                'Reduce waste and improve OEE (Overall Equipment Effectiveness)'
+            ]
+        },
+        'Developing': {
+            'strengths': [
+                'Basic production systems operational',
+                'Workforce with foundational skills',
+                'Willingness to improve'
+            ],
+            'opportunities': [
+                'Establish standard operating procedures',
+                'Implement basic production tracking systems',
+                'Focus on quality control and waste reduction',
+                'Invest in workforce training programs'
+            ]
+        },
+        'Emerging': {
+            'strengths': [
+                'Operational foundation in place',
+                'Potential for significant improvement'
+            ],
+            'opportunities': [
+                'Urgent: Establish basic operational metrics and KPIs',
+                'Implement fundamental quality control processes',
+                'Develop standard work instructions',
+                'Consider consulting support for operational transformation'
+            ]
+        }
+    },
+    'digital': {
+        'World Class': {
+            'strengths': [
+                'Fully integrated digital ecosystem across operations',
+                'Advanced data analytics and AI implementation',
+                'Digital-first culture and mindset'
+            ],
+            'opportunities': [
+                'Explore blockchain for supply chain transparency',
+                'Implement AI-driven demand forecasting',
+                'Develop digital twin capabilities'
+            ]
+        },
+        'Industry Leader': {
+            'strengths': [
+                'Strong digital infrastructure',
+                'Good adoption of digital tools',
+                'Data-driven decision making'
+            ],
+            'opportunities': [
+                'Enhance integration between systems',
+                'Implement advanced analytics',
+                'Expand IoT sensor deployment'
+            ]
+        },
+        'Competitive': {
+            'strengths': [
+                'Basic digital systems in place',
+                'Some automation implemented',
+                'Digital awareness growing'
+            ],
+            'opportunities': [
+                'Invest in ERP system implementation',
+                'Digitize manual processes',
+                'Implement cloud-based solutions',
+                'Develop digital skills in workforce'
+            ]
+        },
+        'Developing': {
+            'strengths': [
+                'Recognition of digital transformation need',
+                'Some basic software tools in use'
+            ],
+            'opportunities': [
+                'Create digital transformation roadmap',
+                'Start with core systems (ERP, inventory management)',
+                'Build digital literacy across organization',
+                'Pilot IoT solutions in one production line'
+            ]
+        },
+        'Emerging': {
+            'strengths': [
+                'Potential for digital leap-frogging',
+                'Clean slate for modern systems'
+            ],
+            'opportunities': [
+                'Critical: Develop comprehensive digital strategy',
+                'Start with basic computerization of records',
+                'Implement simple inventory management software',
+                'Partner with technology providers for guidance'
+            ]
+        }
+    },
+    'supply': {
+        'World Class': {
+            'strengths': [
+                'Resilient and agile supply chain network',
+                'Strategic supplier partnerships',
+                'Advanced supply chain visibility'
+            ],
+            'opportunities': [
+                'Implement circular economy principles',
+                'Develop nearshoring strategies',
+                'Enhance supply chain risk management'
+            ]
+        },
+        'Industry Leader': {
+            'strengths': [
+                'Well-managed supplier relationships',
+                'Good inventory management',
+                'Effective logistics operations'
+            ],
+            'opportunities': [
+                'Implement supplier collaboration platforms',
+                'Enhance demand forecasting accuracy',
+                'Optimize inventory levels with AI'
+            ]
+        },
+        'Competitive': {
+            'strengths': [
+                'Established supplier base',
+                'Basic supply chain processes',
+                'Adequate inventory control'
+            ],
+            'opportunities': [
+                'Implement vendor management system',
+                'Improve supplier quality metrics',
+                'Reduce lead times through better planning',
+                'Develop alternative sourcing strategies'
+            ]
+        },
+        'Developing': {
+            'strengths': [
+                'Core supplier relationships established',
+                'Basic procurement processes'
+            ],
+            'opportunities': [
+                'Formalize supplier evaluation criteria',
+                'Implement inventory management system',
+                'Develop supply chain visibility',
+                'Establish safety stock policies'
+            ]
+        },
+        'Emerging': {
+            'strengths': [
+                'Opportunity to build modern supply chain',
+                'Flexibility in supplier selection'
+            ],
+            'opportunities': [
+                'Urgent: Map current supply chain',
+                'Establish formal procurement processes',
+                'Implement basic inventory tracking',
+                'Develop supplier qualification system'
+            ]
+        }
+    },
+    'sustainability': {
+        'World Class': {
+            'strengths': [
+                'Industry-leading sustainability practices',
+                'Comprehensive ESG reporting',
+                'Circular economy implementation'
+            ],
+            'opportunities': [
+                'Achieve carbon neutrality',
+                'Lead industry sustainability initiatives',
+                'Develop sustainable product innovations'
+            ]
+        },
+        'Industry Leader': {
+            'strengths': [
+                'Strong environmental management',
+                'Good compliance with regulations',
+                'Sustainability initiatives underway'
+            ],
+            'opportunities': [
+                'Obtain sustainability certifications (GOTS, OEKO-TEX)',
+                'Implement water recycling systems',
+                'Transition to renewable energy'
+            ]
+        },
+        'Competitive': {
+            'strengths': [
+                'Basic environmental compliance',
+                'Awareness of sustainability importance',
+                'Some green initiatives'
+            ],
+            'opportunities': [
+                'Develop comprehensive sustainability strategy',
+                'Measure and reduce carbon footprint',
+                'Implement waste reduction programs',
+                'Source sustainable materials'
+            ]
+        },
+        'Developing': {
+            'strengths': [
+                'Compliance with basic regulations',
+                'Interest in sustainability'
+            ],
+            'opportunities': [
+                'Conduct environmental impact assessment',
+                'Implement energy efficiency measures',
+                'Establish waste management system',
+                'Train staff on sustainability practices'
+            ]
+        },
+        'Emerging': {
+            'strengths': [
+                'Potential for sustainable transformation',
+                'Growing market demand for sustainability'
+            ],
+            'opportunities': [
+                'Critical: Ensure environmental compliance',
+                'Start with basic waste segregation',
+                'Measure current resource consumption',
+                'Develop sustainability roadmap'
+            ]
+        }
+    },
+    'quality': {
+        'World Class': {
+            'strengths': [
+                'Zero-defect culture and Six Sigma implementation',
+                'Comprehensive quality management system',
+                'International certifications (ISO 9001, etc.)'
+            ],
+            'opportunities': [
+                'Implement AI-powered quality inspection',
+                'Achieve additional premium certifications',
+                'Lead industry quality standards development'
+            ]
+        },
+        'Industry Leader': {
+            'strengths': [
+                'Strong quality control processes',
+                'Good compliance track record',
+                'Effective testing procedures'
+            ],
+            'opportunities': [
+                'Implement statistical process control',
+                'Enhance supplier quality management',
+                'Pursue advanced certifications'
+            ]
+        },
+        'Competitive': {
+            'strengths': [
+                'Basic quality systems in place',
+                'Regular inspections conducted',
+                'Quality awareness present'
+            ],
+            'opportunities': [
+                'Implement formal QMS (ISO 9001)',
+                'Enhance in-process quality checks',
+                'Reduce defect rates through root cause analysis',
+                'Invest in testing equipment'
+            ]
+        },
+        'Developing': {
+            'strengths': [
+                'Basic quality checks performed',
+                'Understanding of quality importance'
+            ],
+            'opportunities': [
+                'Establish quality control department',
+                'Implement inspection checklists',
+                'Train quality inspectors',
+                'Document quality procedures'
+            ]
+        },
+        'Emerging': {
+            'strengths': [
+                'Opportunity to build quality culture',
+                'Potential for significant improvement'
+            ],
+            'opportunities': [
+                'Urgent: Implement basic quality checks',
+                'Establish acceptance criteria',
+                'Train workforce on quality standards',
+                'Invest in basic testing equipment'
+            ]
+        }
+    },
+    'financial': {
+        'World Class': {
+            'strengths': [
+                'Excellent financial performance and margins',
+                'Strong cash flow management',
+                'Strategic financial planning'
+            ],
+            'opportunities': [
+                'Explore strategic acquisitions',
+                'Invest in R&D and innovation',
+                'Expand into premium segments'
+            ]
+        },
+        'Industry Leader': {
+            'strengths': [
+                'Good profitability and growth',
+                'Effective cost management',
+                'Healthy financial ratios'
+            ],
+            'opportunities': [
+                'Optimize working capital',
+                'Enhance pricing strategies',
+                'Improve financial forecasting'
+            ]
+        },
+        'Competitive': {
+            'strengths': [
+                'Stable financial position',
+                'Basic financial controls',
+                'Adequate profitability'
+            ],
+            'opportunities': [
+                'Implement activity-based costing',
+                'Improve margin management',
+                'Enhance financial reporting',
+                'Optimize product mix'
+            ]
+        },
+        'Developing': {
+            'strengths': [
+                'Business generating revenue',
+                'Basic accounting in place'
+            ],
+            'opportunities': [
+                'Implement proper cost accounting',
+                'Improve cash flow management',
+                'Develop financial KPIs',
+                'Enhance pricing discipline'
+            ]
+        },
+        'Emerging': {
+            'strengths': [
+                'Business operational',
+                'Potential for improvement'
+            ],
+            'opportunities': [
+                'Critical: Establish proper accounting systems',
+                'Implement basic financial controls',
+                'Develop pricing strategy',
+                'Focus on cash flow management'
+            ]
+        }
+    }
+}
+
+# Map category names to insight keys
+INSIGHT_CATEGORY_KEYS = MappingProxyType({
+    'operational': 'operational',
+    'digital': 'digital',
+    'supply': 'supply',
+    'sustainability': 'sustainability',
+    'quality': 'quality',
+    'financial': 'financial'
+})
+
+DEFAULT_INSIGHTS = MappingProxyType({
+    'strengths': ('Assessment completed',),
+    'opportunities': ('Continue improvement efforts',)
+})
+
+def load_insights_library(path: str) -> Dict:
+    """Load an insights library from a JSON file shaped like INSIGHTS_LIBRARY"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def build_insights_index(library: Dict) -> Mapping:
+    """Index an insights library by (category, tier) as read-only tuples"""
+    index = {}
+    for category, tiers in library.items():
+        for tier, insights in tiers.items():
+            index[(category, tier)] = MappingProxyType({
+                'strengths': tuple(insights.get('strengths', ())),
+                'opportunities': tuple(insights.get('opportunities', ()))
+            })
+    return MappingProxyType(index)
+
+# Built once per process; DATRIX_INSIGHTS_FILE overrides the built-in library
+INSIGHTS_INDEX = build_insights_index(
+    load_insights_library(os.environ['DATRIX_INSIGHTS_FILE'])
+    if os.getenv('DATRIX_INSIGHTS_FILE') else INSIGHTS_LIBRARY
+)
 
 class ReportGenerator:
     """Generate professional assessment reports with industry benchmarks"""
@@ -106,405 +528,27 @@ class ReportGenerator:
     @staticmethod
     def generate_insights(category: str, score: float, tier: str) -> Dict:
         """Generate McKinsey-style insights for each category"""
+        insight_key = INSIGHT_CATEGORY_KEYS.get(category, 'operational')
+        return INSIGHTS_INDEX.get((insight_key, tier), DEFAULT_INSIGHTS)
+    
+    @staticmethod
+    def assessment_date(assessment_data: Dict) -> str:
+        """Display date of an assessment, from when it was completed
         
-        insights_map = {
-            'operational': {
-                'World Class': {
-                    'strengths': [
-                        'Exceptional operational efficiency with lean manufacturing principles',
-                        'Advanced production planning and scheduling systems',
-                        'Industry-leading capacity utilization rates'
-                    ],
-                    'opportunities': [
-                        'Share best practices with industry peers',
-                        'Explore Industry 4.0 automation opportunities',
-                        'Consider vertical integration strategies'
-                    ]
-                },
-                'Industry Leader': {
-                    'strengths': [
-                        'Strong operational processes and workflows',
-                        'Good production efficiency metrics',
-                        'Effective resource management'
-                    ],
-                    'opportunities': [
-                        'Implement advanced analytics for predictive maintenance',
-                        'Optimize production line balancing',
-                        'Enhance real-time monitoring capabilities'
-                    ]
-                },
-                'Competitive': {
-                    'strengths': [
-                        'Established operational procedures',
-                        'Adequate production capabilities',
-                        'Basic efficiency tracking in place'
-                    ],
-                    'opportunities': [
-                        'Implement lean manufacturing methodologies',
-                        'Invest in production planning software',
-                        'Reduce waste and improve OEE (Overall Equipment Effectiveness)'
-                    ]
-                },
-                'Developing': {
-                    'strengths': [
-                        'Basic production systems operational',
-                        'Workforce with foundational skills',
-                        'Willingness to improve'
-                    ],
-                    'opportunities': [
-                        'Establish standard operating procedures',
-                        'Implement basic production tracking systems',
-                        'Focus on quality control and waste reduction',
-                        'Invest in workforce training programs'
-                    ]
-                },
-                'Emerging': {
-                    'strengths': [
-                        'Operational foundation in place',
-                        'Potential for significant improvement'
-                    ],
-                    'opportunities': [
-                        'Urgent: Establish basic operational metrics and KPIs',
-                        'Implement fundamental quality control processes',
-                        'Develop standard work instructions',
-                        'Consider consulting support for operational transformation'
-                    ]
-                }
-            },
-            'digital': {
-                'World Class': {
-                    'strengths': [
-                        'Fully integrated digital ecosystem across operations',
-                        'Advanced data analytics and AI implementation',
-                        'Digital-first culture and mindset'
-                    ],
-                    'opportunities': [
-                        'Explore blockchain for supply chain transparency',
-                        'Implement AI-driven demand forecasting',
-                        'Develop digital twin capabilities'
-                    ]
-                },
-                'Industry Leader': {
-                    'strengths': [
-                        'Strong digital infrastructure',
-                        'Good adoption of digital tools',
-                        'Data-driven decision making'
-                    ],
-                    'opportunities': [
-                        'Enhance integration between systems',
-                        'Implement advanced analytics',
-                        'Expand IoT sensor deployment'
-                    ]
-                },
-                'Competitive': {
-                    'strengths': [
-                        'Basic digital systems in place',
-                        'Some automation implemented',
-                        'Digital awareness growing'
-                    ],
-                    'opportunities': [
-                        'Invest in ERP system implementation',
-                        'Digitize manual processes',
-                        'Implement cloud-based solutions',
-                        'Develop digital skills in workforce'
-                    ]
-                },
-                'Developing': {
-                    'strengths': [
-                        'Recognition of digital transformation need',
-                        'Some basic software tools in use'
-                    ],
-                    'opportunities': [
-                        'Create digital transformation roadmap',
-                        'Start with core systems (ERP, inventory management)',
-                        'Build digital literacy across organization',
-                        'Pilot IoT solutions in one production line'
-                    ]
-                },
-                'Emerging': {
-                    'strengths': [
-                        'Potential for digital leap-frogging',
-                        'Clean slate for modern systems'
-                    ],
-                    'opportunities': [
-                        'Critical: Develop comprehensive digital strategy',
-                        'Start with basic computerization of records',
-                        'Implement simple inventory management software',
-                        'Partner with technology providers for guidance'
-                    ]
-                }
-            },
-            'supply': {
-                'World Class': {
-                    'strengths': [
-                        'Resilient and agile supply chain network',
-                        'Strategic supplier partnerships',
-                        'Advanced supply chain visibility'
-                    ],
-                    'opportunities': [
-                        'Implement circular economy principles',
-                        'Develop nearshoring strategies',
-                        'Enhance supply chain risk management'
-                    ]
-                },
-                'Industry Leader': {
-                    'strengths': [
-                        'Well-managed supplier relationships',
-                        'Good inventory management',
-                        'Effective logistics operations'
-                    ],
-                    'opportunities': [
-                        'Implement supplier collaboration platforms',
-                        'Enhance demand forecasting accuracy',
-                        'Optimize inventory levels with AI'
-                    ]
-                },
-                'Competitive': {
-                    'strengths': [
-                        'Established supplier base',
-                        'Basic supply chain processes',
-                        'Adequate inventory control'
-                    ],
-                    'opportunities': [
-                        'Implement vendor management system',
-                        'Improve supplier quality metrics',
-                        'Reduce lead times through better planning',
-                        'Develop alternative sourcing strategies'
-                    ]
-                },
-                'Developing': {
-                    'strengths': [
-                        'Core supplier relationships established',
-                        'Basic procurement processes'
-                    ],
-                    'opportunities': [
-                        'Formalize supplier evaluation criteria',
-                        'Implement inventory management system',
-                        'Develop supply chain visibility',
-                        'Establish safety stock policies'
-                    ]
-                },
-                'Emerging': {
-                    'strengths': [
-                        'Opportunity to build modern supply chain',
-                        'Flexibility in supplier selection'
-                    ],
-                    'opportunities': [
-                        'Urgent: Map current supply chain',
-                        'Establish formal procurement processes',
-                        'Implement basic inventory tracking',
-                        'Develop supplier qualification system'
-                    ]
-                }
-            },
-            'sustainability': {
-                'World Class': {
-                    'strengths': [
-                        'Industry-leading sustainability practices',
-                        'Comprehensive ESG reporting',
-                        'Circular economy implementation'
-                    ],
-                    'opportunities': [
-                        'Achieve carbon neutrality',
-                        'Lead industry sustainability initiatives',
-                        'Develop sustainable product innovations'
-                    ]
-                },
-                'Industry Leader': {
-                    'strengths': [
-                        'Strong environmental management',
-                        'Good compliance with regulations',
-                        'Sustainability initiatives underway'
-                    ],
-                    'opportunities': [
-                        'Obtain sustainability certifications (GOTS, OEKO-TEX)',
-                        'Implement water recycling systems',
-                        'Transition to renewable energy'
-                    ]
-                },
-                'Competitive': {
-                    'strengths': [
-                        'Basic environmental compliance',
-                        'Awareness of sustainability importance',
-                        'Some green initiatives'
-                    ],
-                    'opportunities': [
-                        'Develop comprehensive sustainability strategy',
-                        'Measure and reduce carbon footprint',
-                        'Implement waste reduction programs',
-                        'Source sustainable materials'
-                    ]
-                },
-                'Developing': {
-                    'strengths': [
-                        'Compliance with basic regulations',
-                        'Interest in sustainability'
-                    ],
-                    'opportunities': [
-                        'Conduct environmental impact assessment',
-                        'Implement energy efficiency measures',
-                        'Establish waste management system',
-                        'Train staff on sustainability practices'
-                    ]
-                },
-                'Emerging': {
-                    'strengths': [
-                        'Potential for sustainable transformation',
-                        'Growing market demand for sustainability'
-                    ],
-                    'opportunities': [
-                        'Critical: Ensure environmental compliance',
-                        'Start with basic waste segregation',
-                        'Measure current resource consumption',
-                        'Develop sustainability roadmap'
-                    ]
-                }
-            },
-            'quality': {
-                'World Class': {
-                    'strengths': [
-                        'Zero-defect culture and Six Sigma implementation',
-                        'Comprehensive quality management system',
-                        'International certifications (ISO 9001, etc.)'
-                    ],
-                    'opportunities': [
-                        'Implement AI-powered quality inspection',
-                        'Achieve additional premium certifications',
-                        'Lead industry quality standards development'
-                    ]
-                },
-                'Industry Leader': {
-                    'strengths': [
-                        'Strong quality control processes',
-                        'Good compliance track record',
-                        'Effective testing procedures'
-                    ],
-                    'opportunities': [
-                        'Implement statistical process control',
-                        'Enhance supplier quality management',
-                        'Pursue advanced certifications'
-                    ]
-                },
-                'Competitive': {
-                    'strengths': [
-                        'Basic quality systems in place',
-                        'Regular inspections conducted',
-                        'Quality awareness present'
-                    ],
-                    'opportunities': [
-                        'Implement formal QMS (ISO 9001)',
-                        'Enhance in-process quality checks',
-                        'Reduce defect rates through root cause analysis',
-                        'Invest in testing equipment'
-                    ]
-                },
-                'Developing': {
-                    'strengths': [
-                        'Basic quality checks performed',
-                        'Understanding of quality importance'
-                    ],
-                    'opportunities': [
-                        'Establish quality control department',
-                        'Implement inspection checklists',
-                        'Train quality inspectors',
-                        'Document quality procedures'
-                    ]
-                },
-                'Emerging': {
-                    'strengths': [
-                        'Opportunity to build quality culture',
-                        'Potential for significant improvement'
-                    ],
-                    'opportunities': [
-                        'Urgent: Implement basic quality checks',
-                        'Establish acceptance criteria',
-                        'Train workforce on quality standards',
-                        'Invest in basic testing equipment'
-                    ]
-                }
-            },
-            'financial': {
-                'World Class': {
-                    'strengths': [
-                        'Excellent financial performance and margins',
-                        'Strong cash flow management',
-                        'Strategic financial planning'
-                    ],
-                    'opportunities': [
-                        'Explore strategic acquisitions',
-                        'Invest in R&D and innovation',
-                        'Expand into premium segments'
-                    ]
-                },
-                'Industry Leader': {
-                    'strengths': [
-                        'Good profitability and growth',
-                        'Effective cost management',
-                        'Healthy financial ratios'
-                    ],
-                    'opportunities': [
-                        'Optimize working capital',
-                        'Enhance pricing strategies',
-                        'Improve financial forecasting'
-                    ]
-                },
-                'Competitive': {
-                    'strengths': [
-                        'Stable financial position',
-                        'Basic financial controls',
-                        'Adequate profitability'
-                    ],
-                    'opportunities': [
-                        'Implement activity-based costing',
-                        'Improve margin management',
-                        'Enhance financial reporting',
-                        'Optimize product mix'
-                    ]
-                },
-                'Developing': {
-                    'strengths': [
-                        'Business generating revenue',
-                        'Basic accounting in place'
-                    ],
-                    'opportunities': [
-                        'Implement proper cost accounting',
-                        'Improve cash flow management',
-                        'Develop financial KPIs',
-                        'Enhance pricing discipline'
-                    ]
-                },
-                'Emerging': {
-                    'strengths': [
-                        'Business operational',
-                        'Potential for improvement'
-                    ],
-                    'opportunities': [
-                        'Critical: Establish proper accounting systems',
-                        'Implement basic financial controls',
-                        'Develop pricing strategy',
-                        'Focus on cash flow management'
-                    ]
-                }
-            }
-        }
-        
-        # Map category names to insight keys
-        category_map = {
-            'operational': 'operational',
-            'digital': 'digital',
-            'supply': 'supply',
-            'sustainability': 'sustainability',
-            'quality': 'quality',
-            'financial': 'financial'
-        }
-        
-        insight_key = category_map.get(category, 'operational')
-        tier_insights = insights_map.get(insight_key, {}).get(tier, {
-            'strengths': ['Assessment completed'],
-            'opportunities': ['Continue improvement efforts']
-        })
-        
-        return tier_insights
+        Taken from the stored row rather than the clock, so a cached report
+        shows the same date however long after submission it is viewed.
+        """
+        stamp = assessment_data.get('completed_at') or assessment_data.get('created_at')
+        when = None
+        if isinstance(stamp, str):
+            try:
+                when = datetime.fromisoformat(stamp.replace('Z', '+00:00'))
+            except ValueError:
+                try:
+                    when = datetime.strptime(stamp[:10], '%Y-%m-%d')
+                except ValueError:
+                    when = None
+        return (when or datetime.now()).strftime('%B %d, %Y')
     
     @staticmethod
     def generate_report_data(user_data: Dict, assessment_data: Dict) -> Dict:
@@ -546,7 +590,7 @@ class ReportGenerator:
                 'mobile': user_data.get('mobile', 'N/A')
             },
             'assessment_info': {
-                'date': datetime.now().strftime('%B %d, %Y'),
+                'date': ReportGenerator.assessment_date(assessment_data),
                 'assessment_id': assessment_data.get('id', 'N/A'),
                 'overall_score': round(overall_score, 1),
                 'overall_tier': overall_tier
@@ -650,3 +694,18 @@ your competitive position in the global apparel market.
         
         return next_steps_map.get(tier, next_steps_map['Competitive'])
 
+
+# Bump when the report structure or generation logic changes
+REPORT_SCHEMA_VERSION = 2
+
+def _report_fingerprint() -> str:
+    """Hash the benchmarks and insights that report content depends on"""
+    insights = sorted(
+        [category, tier, list(v['strengths']), list(v['opportunities'])]
+        for (category, tier), v in INSIGHTS_INDEX.items()
+    )
+    payload = json.dumps([ReportGenerator.INDUSTRY_BENCHMARKS, insights], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+# Identifies the report framework; cached reports from other versions are stale
+REPORT_VERSION = f"{REPORT_SCHEMA_VERSION}-{_report_fingerprint()}"
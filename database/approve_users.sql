@@ -0,0 +1,40 @@
+-- Datrix™ Business Intelligence Scanner - Bulk User Approval
+-- Approves many verified users in one statement, each with its own
+-- assessment token. Called by /api/admin/approve-users with a JSON array
+-- of {id, assessment_token} objects.
+-- Run after supabase_schema.sql. Safe to re-run.
+
+CREATE OR REPLACE FUNCTION approve_users(approvals JSONB)
+RETURNS SETOF UUID AS $$
+    -- Only users that still exist, are verified and are not yet approved are
+    -- updated; nothing is inserted, so a user deleted since the admin's read
+    -- stays deleted, and an overlapping batch cannot replace a token that was
+    -- already issued.
+    -- Rows are locked in id order so overlapping batches cannot deadlock.
+    WITH approval AS (
+        SELECT *
+        FROM jsonb_to_recordset(approvals) AS a(id UUID, assessment_token VARCHAR(32))
+    ),
+    locked AS (
+        SELECT u.id
+        FROM public.users u
+        JOIN approval a ON a.id = u.id
+        WHERE u.is_verified AND NOT u.is_approved
+        ORDER BY u.id
+        FOR UPDATE OF u
+    )
+    UPDATE public.users u
+    SET is_approved = TRUE,
+        status = 'approved',
+        assessment_token = a.assessment_token,
+        updated_at = NOW()
+    FROM approval a
+    JOIN locked l ON l.id = a.id
+    WHERE u.id = a.id
+    RETURNING u.id;
+$$ LANGUAGE sql SET search_path = public, pg_temp;
+
+REVOKE EXECUTE ON FUNCTION approve_users(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION approve_users(JSONB) TO service_role;
+
+COMMENT ON FUNCTION approve_users(JSONB) IS 'Approve verified, not yet approved users with per-user assessment tokens; returns the ids approved';
@@ -0,0 +1,220 @@
+-- Datrix™ Business Intelligence Scanner - Materialised Dashboard Statistics
+-- Counters are maintained by triggers as users register, verify, get approved
+-- and submit assessments, so the admin dashboard reads a handful of rows
+-- instead of counting the users and assessments tables on every load.
+-- Run after supabase_schema.sql. Safe to re-run.
+
+-- Running totals (users by status, all users, all assessments)
+CREATE TABLE IF NOT EXISTS public.dashboard_counters (
+    counter VARCHAR(50) PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Per-day counts; rolling windows sum at most 31 rows from the primary key
+CREATE TABLE IF NOT EXISTS public.dashboard_daily_counts (
+    day DATE NOT NULL,
+    counter VARCHAR(50) NOT NULL,
+    value BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (counter, day)
+);
+
+ALTER TABLE public.dashboard_counters ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.dashboard_daily_counts ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Admins can view dashboard counters" ON public.dashboard_counters;
+CREATE POLICY "Admins can view dashboard counters" ON public.dashboard_counters FOR SELECT USING (auth.jwt() ->> 'role' = 'admin');
+DROP POLICY IF EXISTS "Admins can view dashboard daily counts" ON public.dashboard_daily_counts;
+CREATE POLICY "Admins can view dashboard daily counts" ON public.dashboard_daily_counts FOR SELECT USING (auth.jwt() ->> 'role' = 'admin');
+
+-- Add delta to a running total
+CREATE OR REPLACE FUNCTION bump_dashboard_counter(counter_name TEXT, delta BIGINT)
+RETURNS VOID AS $$
+BEGIN
+    IF counter_name IS NULL OR delta = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO public.dashboard_counters (counter, value, updated_at)
+    VALUES (counter_name, delta, NOW())
+    ON CONFLICT (counter) DO UPDATE
+    SET value = public.dashboard_counters.value + EXCLUDED.value,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Add delta to a per-day count
+CREATE OR REPLACE FUNCTION bump_dashboard_daily_count(counter_name TEXT, count_day DATE, delta BIGINT)
+RETURNS VOID AS $$
+BEGIN
+    IF count_day IS NULL OR delta = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO public.dashboard_daily_counts (day, counter, value)
+    VALUES (count_day, counter_name, delta)
+    ON CONFLICT (counter, day) DO UPDATE
+    SET value = public.dashboard_daily_counts.value + EXCLUDED.value;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Apply several counter deltas, locking the counter rows in name order so
+-- concurrent writers always take them in the same order and cannot deadlock
+CREATE OR REPLACE FUNCTION bump_dashboard_counters(counter_names TEXT[], deltas BIGINT[])
+RETURNS VOID AS $$
+DECLARE
+    bump RECORD;
+BEGIN
+    FOR bump IN
+        SELECT name, SUM(delta) AS delta
+        FROM unnest(counter_names, deltas) AS t(name, delta)
+        WHERE name IS NOT NULL
+        GROUP BY name
+        ORDER BY name
+    LOOP
+        PERFORM public.bump_dashboard_counter(bump.name, bump.delta);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Apply several per-day deltas to one counter, locking the day rows in date order
+CREATE OR REPLACE FUNCTION bump_dashboard_daily_counts(counter_name TEXT, count_days DATE[], deltas BIGINT[])
+RETURNS VOID AS $$
+DECLARE
+    bump RECORD;
+BEGIN
+    FOR bump IN
+        SELECT day, SUM(delta) AS delta
+        FROM unnest(count_days, deltas) AS t(day, delta)
+        WHERE day IS NOT NULL
+        GROUP BY day
+        ORDER BY day
+    LOOP
+        PERFORM public.bump_dashboard_daily_count(counter_name, bump.day, bump.delta);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Keep user counters in step with registrations, status changes and deletions.
+-- Running totals are always bumped before per-day counts.
+CREATE OR REPLACE FUNCTION track_user_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM public.bump_dashboard_counters(ARRAY['users_' || NEW.status, 'users_total'], ARRAY[1, 1]::BIGINT[]);
+        PERFORM public.bump_dashboard_daily_counts('new_users', ARRAY[NEW.created_at::date], ARRAY[1]::BIGINT[]);
+        RETURN NEW;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        PERFORM public.bump_dashboard_counters(ARRAY['users_' || OLD.status, 'users_total'], ARRAY[-1, -1]::BIGINT[]);
+        PERFORM public.bump_dashboard_daily_counts('new_users', ARRAY[OLD.created_at::date], ARRAY[-1]::BIGINT[]);
+        RETURN OLD;
+    END IF;
+
+    -- An update moves a user between status counters and, only if created_at
+    -- changed, between days; users_total is untouched
+    IF OLD.status IS DISTINCT FROM NEW.status THEN
+        PERFORM public.bump_dashboard_counters(ARRAY['users_' || OLD.status, 'users_' || NEW.status], ARRAY[-1, 1]::BIGINT[]);
+    END IF;
+    IF OLD.created_at IS DISTINCT FROM NEW.created_at THEN
+        PERFORM public.bump_dashboard_daily_counts('new_users', ARRAY[OLD.created_at::date, NEW.created_at::date], ARRAY[-1, 1]::BIGINT[]);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Keep assessment counters in step with submissions and deletions
+CREATE OR REPLACE FUNCTION track_assessment_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM public.bump_dashboard_counter('assessments_total', 1);
+        PERFORM public.bump_dashboard_daily_count('assessments', NEW.completed_at::date, 1);
+        RETURN NEW;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        PERFORM public.bump_dashboard_counter('assessments_total', -1);
+        PERFORM public.bump_dashboard_daily_count('assessments', OLD.completed_at::date, -1);
+        RETURN OLD;
+    END IF;
+
+    -- A changed completed_at only moves the assessment between days
+    PERFORM public.bump_dashboard_daily_counts('assessments', ARRAY[OLD.completed_at::date, NEW.completed_at::date], ARRAY[-1, 1]::BIGINT[]);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Updates only fire when a counted column actually changes
+DROP TRIGGER IF EXISTS track_users_insert_delete ON public.users;
+CREATE TRIGGER track_users_insert_delete AFTER INSERT OR DELETE ON public.users FOR EACH ROW EXECUTE FUNCTION track_user_stats();
+DROP TRIGGER IF EXISTS track_users_update ON public.users;
+CREATE TRIGGER track_users_update AFTER UPDATE OF status, created_at ON public.users FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.created_at IS DISTINCT FROM NEW.created_at)
+    EXECUTE FUNCTION track_user_stats();
+
+DROP TRIGGER IF EXISTS track_assessments_insert_delete ON public.assessments;
+CREATE TRIGGER track_assessments_insert_delete AFTER INSERT OR DELETE ON public.assessments FOR EACH ROW EXECUTE FUNCTION track_assessment_stats();
+DROP TRIGGER IF EXISTS track_assessments_update ON public.assessments;
+CREATE TRIGGER track_assessments_update AFTER UPDATE OF completed_at ON public.assessments FOR EACH ROW
+    WHEN (OLD.completed_at IS DISTINCT FROM NEW.completed_at)
+    EXECUTE FUNCTION track_assessment_stats();
+
+-- Rebuild every counter from the base tables (initial backfill or drift repair)
+CREATE OR REPLACE FUNCTION refresh_dashboard_stats()
+RETURNS VOID AS $$
+BEGIN
+    -- Block writes to the counted tables so no trigger bump is lost mid-rebuild
+    LOCK TABLE public.users, public.assessments IN SHARE MODE;
+
+    DELETE FROM public.dashboard_counters;
+    DELETE FROM public.dashboard_daily_counts;
+
+    INSERT INTO public.dashboard_counters (counter, value)
+    SELECT 'users_' || status, COUNT(*) FROM public.users WHERE status IS NOT NULL GROUP BY status
+    UNION ALL
+    SELECT 'users_total', COUNT(*) FROM public.users
+    UNION ALL
+    SELECT 'assessments_total', COUNT(*) FROM public.assessments;
+
+    INSERT INTO public.dashboard_daily_counts (day, counter, value)
+    SELECT created_at::date, 'new_users', COUNT(*) FROM public.users WHERE created_at IS NOT NULL GROUP BY created_at::date
+    UNION ALL
+    SELECT completed_at::date, 'assessments', COUNT(*) FROM public.assessments WHERE completed_at IS NOT NULL GROUP BY completed_at::date;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Definer functions bypass RLS, so only the service role may call them directly;
+-- the triggers still run them for every writer
+REVOKE EXECUTE ON FUNCTION bump_dashboard_counter(TEXT, BIGINT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION bump_dashboard_daily_count(TEXT, DATE, BIGINT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION bump_dashboard_counters(TEXT[], BIGINT[]) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION bump_dashboard_daily_counts(TEXT, DATE[], BIGINT[]) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION track_user_stats() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION track_assessment_stats() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION refresh_dashboard_stats() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION bump_dashboard_counter(TEXT, BIGINT) TO service_role;
+GRANT EXECUTE ON FUNCTION bump_dashboard_daily_count(TEXT, DATE, BIGINT) TO service_role;
+GRANT EXECUTE ON FUNCTION bump_dashboard_counters(TEXT[], BIGINT[]) TO service_role;
+GRANT EXECUTE ON FUNCTION bump_dashboard_daily_counts(TEXT, DATE[], BIGINT[]) TO service_role;
+GRANT EXECUTE ON FUNCTION refresh_dashboard_stats() TO service_role;
+
+SELECT refresh_dashboard_stats();
+
+-- Same columns as before, now read from the counters; the rolling windows
+-- keep the original CURRENT_DATE based boundaries
+CREATE OR REPLACE VIEW public.admin_dashboard_stats AS
+SELECT
+    (SELECT COALESCE(MAX(value), 0) FROM public.dashboard_counters WHERE counter = 'users_pending') as pending_users,
+    (SELECT COALESCE(MAX(value), 0) FROM public.dashboard_counters WHERE counter = 'users_verified') as verified_users,
+    (SELECT COALESCE(MAX(value), 0) FROM public.dashboard_counters WHERE counter = 'users_approved') as approved_users,
+    (SELECT COALESCE(SUM(value), 0)::bigint FROM public.dashboard_daily_counts WHERE counter = 'assessments' AND day >= CURRENT_DATE - INTERVAL '30 days') as assessments_last_30_days,
+    (SELECT COALESCE(SUM(value), 0)::bigint FROM public.dashboard_daily_counts WHERE counter = 'new_users' AND day >= CURRENT_DATE - INTERVAL '7 days') as new_users_last_7_days,
+    (SELECT COALESCE(MAX(value), 0) FROM public.dashboard_counters WHERE counter = 'users_total') as total_users,
+    (SELECT COALESCE(MAX(value), 0) FROM public.dashboard_counters WHERE counter = 'assessments_total') as total_assessments,
+    (SELECT MAX(updated_at) FROM public.dashboard_counters) as refreshed_at;
+
+COMMENT ON TABLE public.dashboard_counters IS 'Trigger-maintained running totals behind admin_dashboard_stats';
+COMMENT ON TABLE public.dashboard_daily_counts IS 'Trigger-maintained per-day registrations and assessments for rolling windows';
+COMMENT ON FUNCTION refresh_dashboard_stats() IS 'Rebuild dashboard counters from the users and assessments tables';
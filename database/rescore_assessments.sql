@@ -0,0 +1,65 @@
+-- Datrix™ Business Intelligence Scanner - Bulk Assessment Rescoring
+-- Writes a page of rescored assessments back in one statement. Called by
+-- the batch rescoring job with a JSON array of
+-- {id, total_score, max_score, percentage, overall_grade, performance_tier,
+--  category_scores, insights, recommendations} objects.
+-- Run after enhanced_schema.sql. Safe to re-run.
+
+-- Scores below 50% are graded F (Emerging), both on submit and on rescore;
+-- the original constraint only allowed A-D, so one such row rejected the
+-- whole page.
+ALTER TABLE public.assessments DROP CONSTRAINT IF EXISTS assessments_overall_grade_check;
+ALTER TABLE public.assessments
+    ADD CONSTRAINT assessments_overall_grade_check CHECK (overall_grade IN ('A', 'B', 'C', 'D', 'F'));
+
+CREATE OR REPLACE FUNCTION apply_assessment_scores(updates JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    -- Only rows that still exist are updated; nothing is re-created. Rows
+    -- are locked in id order so concurrent pages cannot deadlock.
+    WITH scores AS (
+        SELECT *
+        FROM jsonb_to_recordset(updates) AS u(
+            id UUID,
+            total_score INTEGER,
+            max_score INTEGER,
+            percentage DECIMAL(5,2),
+            overall_grade VARCHAR(1),
+            performance_tier VARCHAR(50),
+            category_scores JSONB,
+            insights JSONB,
+            recommendations JSONB
+        )
+    ),
+    locked AS (
+        SELECT a.id
+        FROM public.assessments a
+        JOIN scores s ON s.id = a.id
+        ORDER BY a.id
+        FOR UPDATE OF a
+    )
+    UPDATE public.assessments a
+    SET total_score = s.total_score,
+        max_score = s.max_score,
+        percentage = s.percentage,
+        overall_grade = s.overall_grade,
+        performance_tier = s.performance_tier,
+        category_scores = s.category_scores,
+        insights = COALESCE(s.insights, a.insights),
+        recommendations = COALESCE(s.recommendations, a.recommendations),
+        updated_at = NOW()
+    FROM scores s
+    JOIN locked l ON l.id = s.id
+    WHERE a.id = s.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql SET search_path = public, pg_temp;
+
+REVOKE EXECUTE ON FUNCTION apply_assessment_scores(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION apply_assessment_scores(JSONB) TO service_role;
+
+COMMENT ON FUNCTION apply_assessment_scores(JSONB) IS 'Bulk-update stored assessment scores from a JSON array, one statement per page';
@@ -35,7 +35,7 @@ CREATE TABLE public.assessments (
     total_score INTEGER NOT NULL,
     max_score INTEGER NOT NULL DEFAULT 108, -- 27 questions * 4 max points
     percentage DECIMAL(5,2) NOT NULL,
-    overall_grade VARCHAR(1) NOT NULL CHECK (overall_grade IN ('A', 'B', 'C', 'D')),
+    overall_grade VARCHAR(1) NOT NULL CHECK (overall_grade IN ('A', 'B', 'C', 'D', 'F')),
     category_scores JSONB NOT NULL,
     recommendations JSONB,
     completed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
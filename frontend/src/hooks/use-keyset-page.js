@@ -0,0 +1,80 @@
+import * as React from "react"
+
+// One page of a keyset-paged admin listing (/api/admin/users, /api/admin/assessments).
+// `cursors` holds the cursor each visited page was fetched with, so "previous"
+// re-fetches the page before instead of keeping every page in memory.
+export function useKeysetPage(url, key, params = {}, pageSize = 50) {
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== "")
+  ).toString()
+
+  const [rows, setRows] = React.useState([])
+  const [count, setCount] = React.useState(0)
+  const [cursors, setCursors] = React.useState([null])
+  const [nextCursor, setNextCursor] = React.useState(null)
+  const [loading, setLoading] = React.useState(false)
+  const [error, setError] = React.useState(null)
+  const request = React.useRef(0)
+
+  const load = React.useCallback(async (cursor) => {
+    const id = ++request.current
+    const search = new URLSearchParams(query)
+    search.set("limit", String(pageSize))
+    if (cursor) {
+      // The total only changes with the filters; skip recounting on later pages
+      search.set("cursor", cursor)
+      search.set("count", "none")
+    }
+
+    setLoading(true)
+    setError(null)
+    try {
+      const response = await fetch(`${url}?${search}`)
+      if (!response.ok) {
+        throw new Error(`Failed to fetch ${url}: ${response.status}`)
+      }
+      const data = await response.json()
+      // Ignore responses overtaken by a newer page or filter change
+      if (id !== request.current) return
+      setRows(data[key] || [])
+      setNextCursor(data.next_cursor || null)
+      if (!cursor) setCount(data.count || 0)
+    } catch (err) {
+      if (id === request.current) setError(err)
+    } finally {
+      if (id === request.current) setLoading(false)
+    }
+  }, [url, key, query, pageSize])
+
+  React.useEffect(() => {
+    setCursors([null])
+    load(null)
+  }, [load])
+
+  const next = () => {
+    if (!nextCursor || loading) return
+    setCursors(prev => [...prev, nextCursor])
+    load(nextCursor)
+  }
+
+  const previous = () => {
+    if (cursors.length < 2 || loading) return
+    setCursors(prev => prev.slice(0, -1))
+    load(cursors[cursors.length - 2])
+  }
+
+  const reload = () => load(cursors[cursors.length - 1])
+
+  return {
+    rows,
+    count,
+    page: cursors.length,
+    hasNext: Boolean(nextCursor),
+    hasPrevious: cursors.length > 1,
+    loading,
+    error,
+    next,
+    previous,
+    reload
+  }
+}
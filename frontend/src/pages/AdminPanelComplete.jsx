@@ -4,12 +4,41 @@ import { Button } from '../components/ui/button';
 import { Badge } from '../components/ui/badge';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '../components/ui/tabs';
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '../components/ui/table';
+import { Input } from '../components/ui/input';
+import { useKeysetPage } from '../hooks/use-keyset-page';
 import { 
   Users, CheckCircle, XCircle, Clock, TrendingUp, FileText, Shield, Activity,
   Download, Eye, Calendar, BarChart3, UserCheck, UserX, Mail, Phone, Building2
 } from 'lucide-react';
 
 const API_URL = '/api';
+const PAGE_SIZE = 50;
+const USER_STATUSES = ['pending', 'verified', 'approved', 'suspended'];
+const GRADES = ['A', 'B', 'C', 'D', 'F'];
+const SELECT_CLASS = 'h-9 rounded-md border border-input bg-transparent px-3 text-sm';
+
+// Date inputs give whole days; the listings filter on created_at timestamps
+const dateBounds = ({ from, to }) => ({
+  from: from ? `${from}T00:00:00` : '',
+  to: to ? `${to}T23:59:59.999` : ''
+});
+
+const Pager = ({ listing }) => (
+  <div className="flex items-center justify-between pt-4">
+    <span className="text-sm text-gray-600">
+      Page {listing.page} · {listing.count} total
+      {listing.error && <span className="text-red-600 ml-2">{listing.error.message}</span>}
+    </span>
+    <div className="flex gap-2">
+      <Button size="sm" variant="outline" onClick={listing.previous} disabled={!listing.hasPrevious || listing.loading}>
+        Previous
+      </Button>
+      <Button size="sm" variant="outline" onClick={listing.next} disabled={!listing.hasNext || listing.loading}>
+        Next
+      </Button>
+    </div>
+  </div>
+);
 
 const AdminPanelComplete = () => {
   const [stats, setStats] = useState({
@@ -24,65 +53,48 @@ const AdminPanelComplete = () => {
     conversion_rate: 0
   });
   
-  const [users, setUsers] = useState([]);
-  const [assessments, setAssessments] = useState([]);
+  const [userFilters, setUserFilters] = useState({ status: '', business_type: '', from: '', to: '' });
+  const [assessmentFilters, setAssessmentFilters] = useState({ grade: '', from: '', to: '' });
   const [selectedUser, setSelectedUser] = useState(null);
   const [selectedAssessment, setSelectedAssessment] = useState(null);
   const [loading, setLoading] = useState(true);
   const [activeTab, setActiveTab] = useState('dashboard');
 
+  // Each listing holds one server page; filters are applied by the API
+  const usersPage = useKeysetPage(`${API_URL}/admin/users`, 'users', {
+    status: userFilters.status,
+    business_type: userFilters.business_type.trim(),
+    ...dateBounds(userFilters)
+  }, PAGE_SIZE);
+  const assessmentsPage = useKeysetPage(`${API_URL}/admin/assessments`, 'assessments', {
+    expand: 'user',
+    grade: assessmentFilters.grade,
+    ...dateBounds(assessmentFilters)
+  }, PAGE_SIZE);
+  const pendingPage = useKeysetPage(`${API_URL}/admin/users`, 'users', { status: 'pending' }, PAGE_SIZE);
+  const recentUsers = useKeysetPage(`${API_URL}/admin/users`, 'users', { count: 'none' }, 5);
+  const recentAssessments = useKeysetPage(`${API_URL}/admin/assessments`, 'assessments', { expand: 'user', count: 'none' }, 5);
+
   useEffect(() => {
-    fetchAllData();
+    fetchStats();
   }, []);
 
-  const fetchAllData = async () => {
+  const fetchStats = async () => {
     try {
       setLoading(true);
       
-      // Fetch users
-      const usersResponse = await fetch(`${API_URL}/admin/users`);
-      if (usersResponse.ok) {
-        const usersData = await usersResponse.json();
-        const usersList = usersData.users || [];
-        setUsers(usersList);
-        
-        // Calculate comprehensive stats
-        const now = new Date();
-        const sevenDaysAgo = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-        const thirtyDaysAgo = new Date(now.getTime() - 30 * 24 * 60 * 60 * 1000);
-        
-        const pendingCount = usersList.filter(u => u.status === 'pending').length;
-        const verifiedCount = usersList.filter(u => u.is_verified && !u.is_approved).length;
-        const approvedCount = usersList.filter(u => u.is_approved).length;
-        const newUsersCount = usersList.filter(u => new Date(u.created_at) > sevenDaysAgo).length;
+      // Totals come from the server-side counters, not from the loaded rows
+      const statsResponse = await fetch(`${API_URL}/admin/dashboard-stats`);
+      if (statsResponse.ok) {
+        const statsData = await statsResponse.json();
+        const serverStats = statsData.stats || {};
         
         setStats(prev => ({
           ...prev,
-          total_users: usersList.length,
-          pending_users: pendingCount,
-          verified_users: verifiedCount,
-          approved_users: approvedCount,
-          new_users_last_7_days: newUsersCount
-        }));
-      }
-      
-      // Fetch assessments
-      const assessmentsResponse = await fetch(`${API_URL}/admin/assessments`);
-      if (assessmentsResponse.ok) {
-        const assessmentsData = await assessmentsResponse.json();
-        const assessmentsList = assessmentsData.assessments || [];
-        setAssessments(assessmentsList);
-        
-        const thirtyDaysAgo = new Date(Date.now() - 30 * 24 * 60 * 60 * 1000);
-        const recentAssessments = assessmentsList.filter(a => 
-          new Date(a.created_at) > thirtyDaysAgo
-        ).length;
-        
-        setStats(prev => ({
-          ...prev,
-          total_assessments: assessmentsList.length,
-          assessments_last_30_days: recentAssessments,
-          conversion_rate: users.length > 0 ? ((assessmentsList.length / users.length) * 100).toFixed(1) : 0
+          ...serverStats,
+          conversion_rate: serverStats.total_users > 0
+            ? ((serverStats.total_assessments / serverStats.total_users) * 100).toFixed(1)
+            : 0
         }));
       }
       
@@ -93,6 +105,21 @@ const AdminPanelComplete = () => {
     }
   };
 
+  const refreshAll = () => {
+    fetchStats();
+    [usersPage, assessmentsPage, pendingPage, recentUsers, recentAssessments].forEach(listing => listing.reload());
+  };
+
+  const updateUserFilter = (field) => (event) => {
+    const { value } = event.target;
+    setUserFilters(prev => ({ ...prev, [field]: value }));
+  };
+
+  const updateAssessmentFilter = (field) => (event) => {
+    const { value } = event.target;
+    setAssessmentFilters(prev => ({ ...prev, [field]: value }));
+  };
+
   const handleApproveUser = async (userId) => {
     try {
       const response = await fetch(`${API_URL}/admin/approve-user/${userId}`, {
@@ -103,7 +130,7 @@ const AdminPanelComplete = () => {
       if (response.ok) {
         const data = await response.json();
         alert(`✅ User approved!\n\nAssessment Token: ${data.assessment_token}\n\nShare this link with the user:\n${window.location.origin}/assessment?token=${data.assessment_token}`);
-        fetchAllData();
+        refreshAll();
       } else {
         const error = await response.json();
         alert(`❌ Error: ${error.error}`);
@@ -127,7 +154,7 @@ const AdminPanelComplete = () => {
       
       if (response.ok) {
         alert('User rejected successfully');
-        fetchAllData();
+        refreshAll();
       }
     } catch (error) {
       console.error('Error rejecting user:', error);
@@ -200,7 +227,7 @@ const AdminPanelComplete = () => {
                 <p className="text-sm text-gray-600">Complete Business Intelligence Management</p>
               </div>
             </div>
-            <Button onClick={fetchAllData} variant="outline" className="flex items-center gap-2">
+            <Button onClick={refreshAll} variant="outline" className="flex items-center gap-2">
               <Activity className="w-4 h-4" />
               Refresh Data
             </Button>
@@ -212,8 +239,8 @@ const AdminPanelComplete = () => {
         <Tabs value={activeTab} onValueChange={setActiveTab} className="space-y-6">
           <TabsList className="grid w-full grid-cols-6 lg:w-auto bg-white">
             <TabsTrigger value="dashboard">Dashboard</TabsTrigger>
-            <TabsTrigger value="users">Users ({users.length})</TabsTrigger>
-            <TabsTrigger value="assessments">Assessments ({assessments.length})</TabsTrigger>
+            <TabsTrigger value="users">Users ({stats.total_users})</TabsTrigger>
+            <TabsTrigger value="assessments">Assessments ({stats.total_assessments})</TabsTrigger>
             <TabsTrigger value="pending">Pending ({stats.pending_users})</TabsTrigger>
             <TabsTrigger value="analytics">Analytics</TabsTrigger>
             <TabsTrigger value="funnel">Funnel</TabsTrigger>
@@ -285,7 +312,7 @@ const AdminPanelComplete = () => {
                 </CardHeader>
                 <CardContent>
                   <div className="space-y-4">
-                    {users.slice(0, 5).map(user => (
+                    {recentUsers.rows.map(user => (
                       <div key={user.id} className="flex items-center justify-between p-3 bg-gray-50 rounded-lg">
                         <div className="flex-1">
                           <p className="font-medium text-gray-900">{user.full_name}</p>
@@ -306,8 +333,8 @@ const AdminPanelComplete = () => {
                 </CardHeader>
                 <CardContent>
                   <div className="space-y-4">
-                    {assessments.slice(0, 5).map(assessment => {
-                      const user = users.find(u => u.id === assessment.user_id);
+                    {recentAssessments.rows.map(assessment => {
+                      const user = assessment.users;
                       return (
                         <div key={assessment.id} className="flex items-center justify-between p-3 bg-gray-50 rounded-lg">
                           <div className="flex-1">
@@ -333,6 +360,22 @@ const AdminPanelComplete = () => {
                 <CardDescription>Complete user management and details</CardDescription>
               </CardHeader>
               <CardContent>
+                <div className="flex flex-wrap gap-3 pb-4">
+                  <select className={SELECT_CLASS} value={userFilters.status} onChange={updateUserFilter('status')}>
+                    <option value="">All statuses</option>
+                    {USER_STATUSES.map(status => (
+                      <option key={status} value={status}>{status}</option>
+                    ))}
+                  </select>
+                  <Input
+                    className="w-56"
+                    placeholder="Business type"
+                    value={userFilters.business_type}
+                    onChange={updateUserFilter('business_type')}
+                  />
+                  <Input className="w-40" type="date" value={userFilters.from} onChange={updateUserFilter('from')} />
+                  <Input className="w-40" type="date" value={userFilters.to} onChange={updateUserFilter('to')} />
+                </div>
                 <Table>
                   <TableHeader>
                     <TableRow>
@@ -346,7 +389,7 @@ const AdminPanelComplete = () => {
                     </TableRow>
                   </TableHeader>
                   <TableBody>
-                    {users.map(user => (
+                    {usersPage.rows.map(user => (
                       <TableRow key={user.id}>
                         <TableCell className="font-medium">{user.full_name}</TableCell>
                         <TableCell>{user.email}</TableCell>
@@ -370,6 +413,7 @@ const AdminPanelComplete = () => {
                     ))}
                   </TableBody>
                 </Table>
+                <Pager listing={usersPage} />
               </CardContent>
             </Card>
           </TabsContent>
@@ -382,6 +426,16 @@ const AdminPanelComplete = () => {
                 <CardDescription>View and download assessment reports</CardDescription>
               </CardHeader>
               <CardContent>
+                <div className="flex flex-wrap gap-3 pb-4">
+                  <select className={SELECT_CLASS} value={assessmentFilters.grade} onChange={updateAssessmentFilter('grade')}>
+                    <option value="">All grades</option>
+                    {GRADES.map(grade => (
+                      <option key={grade} value={grade}>Grade {grade}</option>
+                    ))}
+                  </select>
+                  <Input className="w-40" type="date" value={assessmentFilters.from} onChange={updateAssessmentFilter('from')} />
+                  <Input className="w-40" type="date" value={assessmentFilters.to} onChange={updateAssessmentFilter('to')} />
+                </div>
                 <Table>
                   <TableHeader>
                     <TableRow>
@@ -394,8 +448,8 @@ const AdminPanelComplete = () => {
                     </TableRow>
                   </TableHeader>
                   <TableBody>
-                    {assessments.map(assessment => {
-                      const user = users.find(u => u.id === assessment.user_id);
+                    {assessmentsPage.rows.map(assessment => {
+                      const user = assessment.users;
                       return (
                         <TableRow key={assessment.id}>
                           <TableCell className="font-medium">{user?.full_name || 'Unknown'}</TableCell>
@@ -428,6 +482,7 @@ const AdminPanelComplete = () => {
                     })}
                   </TableBody>
                 </Table>
+                <Pager listing={assessmentsPage} />
               </CardContent>
             </Card>
           </TabsContent>
@@ -452,7 +507,7 @@ const AdminPanelComplete = () => {
                     </TableRow>
                   </TableHeader>
                   <TableBody>
-                    {users.filter(u => u.status === 'pending').map(user => (
+                    {pendingPage.rows.map(user => (
                       <TableRow key={user.id}>
                         <TableCell className="font-medium">{user.full_name}</TableCell>
                         <TableCell>{user.email}</TableCell>
@@ -473,6 +528,7 @@ const AdminPanelComplete = () => {
                     ))}
                   </TableBody>
                 </Table>
+                <Pager listing={pendingPage} />
               </CardContent>
             </Card>
           </TabsContent>